@@ -2,55 +2,124 @@
 项目识别智能评分系统 - 主应用
 """
 
+import asyncio
 import logging
+import logging.handlers
+import queue
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from contextlib import asynccontextmanager
 import time
+import orjson
 
 from config import settings
 from .database import init_db, close_db
 from .routers import projects, scoring, analysis
 from .middleware import LoggingMiddleware, RateLimitMiddleware
 
-# 配置日志
+# 配置日志（文件写入由后台线程完成，请求处理中只做入队）
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(
+    log_queue,
+    logging.FileHandler(settings.LOG_FILE),
+    respect_handler_level=True
+)
+
 logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[
-        logging.FileHandler(settings.LOG_FILE),
+        logging.handlers.QueueHandler(log_queue),
         logging.StreamHandler()
     ]
 )
 
 logger = logging.getLogger(__name__)
 
+# 固定内容的响应在导入时预先序列化
+_ROOT_BYTES = orjson.dumps({
+    "app": settings.APP_NAME,
+    "version": settings.APP_VERSION,
+    "status": "running",
+    "environment": "development" if settings.DEBUG else "production"
+})
+
+_INFO_BYTES = orjson.dumps({
+    "name": settings.APP_NAME,
+    "version": settings.APP_VERSION,
+    "docs_url": "/docs" if settings.DEBUG else None,
+    "endpoints": [
+        {"path": "/api/v1/projects", "methods": ["GET", "POST"]},
+        {"path": "/api/v1/projects/{id}", "methods": ["GET", "PUT", "DELETE"]},
+        {"path": "/api/v1/scoring", "methods": ["POST"]},
+        {"path": "/api/v1/analysis", "methods": ["POST"]}
+    ]
+})
+
+def _build_health_bytes(models_ready: bool = False) -> bytes:
+    """按当前时间戳和模型加载状态生成健康检查响应"""
+    return orjson.dumps({
+        "status": "healthy",
+        "timestamp": time.time(),
+        "services": {
+            "database": "connected",  # 实际应检查数据库连接
+            "redis": "connected",     # 实际应检查Redis连接
+            "models": "loaded" if models_ready else "loading"
+        }
+    })
+
+
+# 健康检查响应缓存（由后台任务定期刷新）
+HEALTH_CACHE_BYTES = _build_health_bytes()
+
+
+async def _tick_health_timestamp(app: FastAPI):
+    """每500毫秒刷新一次健康检查响应"""
+    global HEALTH_CACHE_BYTES
+    while True:
+        HEALTH_CACHE_BYTES = _build_health_bytes(app.state.models_ready)
+        await asyncio.sleep(0.5)
+
+
+async def _load_models_background(app: FastAPI):
+    """后台加载机器学习模型，加载完成前应用即可处理请求"""
+    try:
+        from .ml_models import load_models
+        await load_models()
+        app.state.models_ready = True
+        logger.info("机器学习模型已加载")
+    except Exception as e:
+        logger.warning(f"模型加载失败: {e}")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     # 启动时执行
+    log_listener.start()
     logger.info(f"启动 {settings.APP_NAME} v{settings.APP_VERSION}")
     
     # 初始化数据库连接
     await init_db()
     logger.info("数据库连接已初始化")
     
-    # 加载机器学习模型
-    try:
-        from .ml_models import load_models
-        await load_models()
-        logger.info("机器学习模型已加载")
-    except Exception as e:
-        logger.warning(f"模型加载失败: {e}")
+    # 在后台加载机器学习模型，不阻塞启动
+    app.state.models_ready = False
+    models_task = asyncio.create_task(_load_models_background(app))
+    
+    ticker = asyncio.create_task(_tick_health_timestamp(app))
     
     yield
     
     # 关闭时执行
     logger.info("正在关闭应用...")
+    ticker.cancel()
+    models_task.cancel()
     await close_db()
     logger.info("应用已关闭")
+    log_listener.stop()
 
 
 # 创建FastAPI应用
@@ -60,6 +129,7 @@ app = FastAPI(
     description="项目识别智能评分系统API",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -72,6 +142,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 添加GZip压缩中间件（项目列表、示例数据等较大的响应）
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
 # 添加自定义中间件
 app.add_middleware(LoggingMiddleware)
 app.add_middleware(RateLimitMiddleware, requests_per_minute=60)
@@ -112,42 +185,19 @@ async def general_exception_handler(request: Request, exc: Exception):
 @app.get("/")
 async def root():
     """根路径"""
-    return {
-        "app": settings.APP_NAME,
-        "version": settings.APP_VERSION,
-        "status": "running",
-        "environment": "development" if settings.DEBUG else "production"
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 
 @app.get("/health")
 async def health_check():
     """健康检查"""
-    return {
-        "status": "healthy",
-        "timestamp": time.time(),
-        "services": {
-            "database": "connected",  # 实际应检查数据库连接
-            "redis": "connected",     # 实际应检查Redis连接
-            "models": "loaded"        # 实际应检查模型状态
-        }
-    }
+    return Response(content=HEALTH_CACHE_BYTES, media_type="application/json")
 
 
 @app.get("/api/info")
 async def api_info():
     """API信息"""
-    return {
-        "name": settings.APP_NAME,
-        "version": settings.APP_VERSION,
-        "docs_url": "/docs" if settings.DEBUG else None,
-        "endpoints": [
-            {"path": "/api/v1/projects", "methods": ["GET", "POST"]},
-            {"path": "/api/v1/projects/{id}", "methods": ["GET", "PUT", "DELETE"]},
-            {"path": "/api/v1/scoring", "methods": ["POST"]},
-            {"path": "/api/v1/analysis", "methods": ["POST"]}
-        ]
-    }
+    return Response(content=_INFO_BYTES, media_type="application/json")
 
 
 # 注册路由
@@ -158,10 +208,22 @@ app.include_router(analysis.router, prefix="/api/v1/analysis", tags=["分析"])
 
 if __name__ == "__main__":
     import uvicorn
+    
+    # uvloop在Windows上不可用，回退到默认事件循环
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "auto"
+    
     uvicorn.run(
         "app:app",
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
-        workers=settings.WORKERS if not settings.DEBUG else 1
+        workers=settings.WORKERS if not settings.DEBUG else 1,
+        loop=loop,
+        http="httptools",
+        limit_concurrency=1000,
+        timeout_keep_alive=30
     )
\ No newline at end of file
@@ -1,10 +1,12 @@
 # backend/app_cloud.py - 云端部署版FastAPI应用
 import os
 import sys
-import json
+import asyncio
+import orjson
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from contextlib import asynccontextmanager
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent
@@ -12,13 +14,23 @@ sys.path.append(str(project_root))
 
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.decorator import cache
+from redis import asyncio as aioredis
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 import uvicorn
 
 # 导入配置和数据库
 from config_cloud import settings
+from backend.simple_scoring import SimpleScoringAlgorithm
 try:
-    from backend.database_sqlite import get_db, Project, ProjectAnalysis, ScoringLog
+    from backend.database_sqlite import get_db, init_models, close_db, Project, ProjectAnalysis, ScoringLog
 except ImportError:
     # 创建简单的替代类
     class Project:
@@ -28,15 +40,20 @@ except ImportError:
     class ScoringLog:
         pass
     # 创建简单的get_db函数
-    def get_db():
-        return None
+    async def get_db():
+        yield None
+    async def init_models():
+        pass
+    async def close_db():
+        pass
 
 # 导入Pydantic模型
 try:
-    from pydantic import BaseModel
+    from pydantic import BaseModel, ConfigDict
 except ImportError:
     # 如果pydantic不可用，使用简单字典
     BaseModel = dict
+    ConfigDict = dict
 
 # 定义请求/响应模型
 class ProjectCreate(BaseModel):
@@ -53,6 +70,8 @@ class ProjectCreate(BaseModel):
     has_ci_cd: bool = False
 
 class ProjectResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     name: str
     description: Optional[str] = None
@@ -65,14 +84,16 @@ class ProjectResponse(BaseModel):
     has_documentation: bool
     has_tests: bool
     has_ci_cd: bool
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
 class ScoreRequest(BaseModel):
     project_id: int
     algorithm: str = "advanced"
 
 class ScoreResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
     status: str
     project_id: int
     algorithm: str
@@ -82,11 +103,83 @@ class ScoreResponse(BaseModel):
     calculated_at: str
 
 class HealthResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
     status: str
     version: str
     database: str
     features: Dict[str, bool]
 
+# 响应缓存配置
+CACHE_PREFIX = "ratesystem"
+RATING_CACHE_NAMESPACE = "rating"
+
+def path_key_builder(func, namespace: str = "", request=None, response=None, args=None, kwargs=None) -> str:
+    """按请求路径生成缓存键（忽略数据库会话等依赖参数）"""
+    return f"{FastAPICache.get_prefix()}:{namespace}:{request.url.path}"
+
+async def _invalidate_rating_cache(project_id: int):
+    """删除单个项目的评分缓存"""
+    # FastAPICache.clear会先拼接命名空间，传入key时也会清空整个前缀，这里直接按键删除
+    key = f"{CACHE_PREFIX}:{RATING_CACHE_NAMESPACE}:/projects/{project_id}/rating"
+    try:
+        await FastAPICache.get_backend().clear(key=key)
+    except KeyError:
+        # 进程内缓存中没有该键（尚未缓存或已过期）
+        pass
+
+# 固定内容的响应在导入时预先序列化
+_ROOT_BYTES = orjson.dumps({
+    "message": f"欢迎使用{settings.APP_NAME}",
+    "version": settings.VERSION,
+    "docs": "/docs",
+    "health": "/health",
+    "api": "/api/v1",
+    "endpoints": ["/projects", "/analyze", "/scoring"]
+})
+
+def _build_health_bytes() -> bytes:
+    """按当前时间戳生成健康检查响应"""
+    return orjson.dumps({
+        "status": "healthy",
+        "version": settings.VERSION,
+        "timestamp": datetime.now().isoformat(),
+        "database": "sqlite",
+        "message": f"{settings.APP_NAME}运行正常"
+    })
+
+# 健康检查响应缓存（由后台任务定期刷新）
+HEALTH_CACHE_BYTES = _build_health_bytes()
+
+async def _tick_health_timestamp():
+    """每500毫秒刷新一次健康检查响应"""
+    global HEALTH_CACHE_BYTES
+    while True:
+        HEALTH_CACHE_BYTES = _build_health_bytes()
+        await asyncio.sleep(0.5)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期管理"""
+    # 启动时创建引擎和数据表，首个请求无需再初始化连接池
+    await init_models()
+    
+    # 初始化响应缓存（未配置Redis时使用进程内缓存）
+    if settings.REDIS_URL:
+        redis = aioredis.from_url(settings.REDIS_URL)
+        FastAPICache.init(RedisBackend(redis), prefix=CACHE_PREFIX)
+    else:
+        FastAPICache.init(InMemoryBackend(), prefix=CACHE_PREFIX)
+    
+    ticker = asyncio.create_task(_tick_health_timestamp())
+    
+    yield
+    
+    ticker.cancel()
+    
+    # 关闭时释放连接池
+    await close_db()
+
 # 创建FastAPI应用
 app = FastAPI(
     title=settings.APP_NAME,
@@ -94,6 +187,8 @@ app = FastAPI(
     version=settings.VERSION,
     docs_url=settings.DOCS_URL,
     redoc_url=settings.REDOC_URL,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # 添加CORS中间件
@@ -105,181 +200,122 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 添加GZip压缩中间件（项目列表、示例数据等较大的响应）
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
 # 挂载静态文件（如果存在）
 static_dir = project_root / "static"
 if static_dir.exists():
     app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
-# 简单的评分算法（云端简化版）
-class SimpleScoringAlgorithm:
-    """简化的评分算法 - 适合云端部署"""
-    
-    @staticmethod
-    def calculate_score(project_data: Dict[str, Any]) -> Dict[str, Any]:
-        """计算项目评分"""
-        
-        # 基础评分逻辑
-        score = 50.0  # 基础分
-        
-        # 根据项目特征调整分数
-        if project_data.get("has_documentation"):
-            score += 10
-        if project_data.get("has_tests"):
-            score += 15
-        if project_data.get("has_ci_cd"):
-            score += 10
-            
-        # 根据团队规模调整
-        team_size = project_data.get("team_size", 1)
-        if team_size > 5:
-            score += 5
-        elif team_size > 10:
-            score += 10
-            
-        # 根据复杂度调整
-        complexity = project_data.get("estimated_complexity", "低")
-        if complexity == "中等":
-            score += 5
-        elif complexity == "高":
-            score += 10
-            
-        # 确保分数在0-100之间
-        score = max(0, min(100, score))
-        
-        # 生成详细评分
-        breakdown = {
-            "基础分": 50.0,
-            "文档完整性": 10 if project_data.get("has_documentation") else 0,
-            "测试覆盖": 15 if project_data.get("has_tests") else 0,
-            "CI/CD": 10 if project_data.get("has_ci_cd") else 0,
-            "团队规模": min(10, (team_size - 1) * 2),
-            "项目复杂度": {
-                "低": 0,
-                "中等": 5,
-                "高": 10
-            }.get(complexity, 0)
-        }
-        
-        # 生成建议
-        recommendations = []
-        if not project_data.get("has_documentation"):
-            recommendations.append("建议添加项目文档")
-        if not project_data.get("has_tests"):
-            recommendations.append("建议添加单元测试")
-        if not project_data.get("has_ci_cd"):
-            recommendations.append("建议配置CI/CD流水线")
-            
-        return {
-            "final_score": round(score, 1),
-            "breakdown": breakdown,
-            "recommendations": recommendations[:3]  # 最多3条建议
-        }
-
 # API路由
 @app.get("/")
 async def root():
     """根目录"""
-    return {
-        "message": f"欢迎使用{settings.APP_NAME}",
-        "version": settings.APP_VERSION,
-        "docs": "/docs",
-        "health": "/health",
-        "api": "/api/v1",
-        "endpoints": ["/projects", "/analyze", "/scoring"]
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
     """健康检查端点"""
-    return {
-        "status": "healthy",
-        "version": settings.APP_VERSION,
-        "timestamp": datetime.now().isoformat(),
-        "database": "sqlite",
-        "message": f"{settings.APP_NAME}运行正常"
-    }
+    return Response(content=HEALTH_CACHE_BYTES, media_type="application/json")
 
 @app.post("/projects/", response_model=ProjectResponse)
 async def create_project(
     project: ProjectCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """创建新项目"""
     try:
-        db_project = Project(**project.dict())
+        db_project = Project(**project.model_dump())
         db.add(db_project)
-        db.commit()
-        db.refresh(db_project)
-        return db_project.to_dict()
+        await db.commit()
+        await db.refresh(db_project)
+        return ProjectResponse.model_validate(db_project)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"创建项目失败: {str(e)}")
 
 @app.get("/projects/", response_model=List[ProjectResponse])
 async def list_projects(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """列出所有项目"""
     try:
-        projects = db.query(Project).offset(skip).limit(limit).all()
-        return [p.to_dict() for p in projects]
+        # 只查询响应需要的列，跳过ORM对象的创建和identity map
+        columns = [Project.__table__.c[name] for name in ProjectResponse.model_fields]
+        result = await db.execute(select(*columns).offset(skip).limit(limit))
+        # 行数据来自数据库，直接序列化，不再经过response_model重复校验
+        return ORJSONResponse([dict(row._mapping) for row in result])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取项目列表失败: {str(e)}")
 
 @app.get("/projects/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """获取项目详情"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    result = await db.execute(select(Project).where(Project.id == project_id))
+    project = result.scalar_one_or_none()
     if not project:
         raise HTTPException(status_code=404, detail="项目不存在")
-    return project.to_dict()
+    return ProjectResponse.model_validate(project)
 
 @app.post("/analyze/score", response_model=ScoreResponse)
 async def score_project(
     request: ScoreRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """项目评分"""
     try:
-        # 获取项目信息
-        project = db.query(Project).filter(Project.id == request.project_id).first()
-        if not project:
-            raise HTTPException(status_code=404, detail="项目不存在")
-        
-        # 转换为字典格式
-        project_data = project.to_dict()
-        
-        # 使用简化算法评分
-        algorithm = SimpleScoringAlgorithm()
-        score_result = algorithm.calculate_score(project_data)
-        
-        # 更新项目评分信息
-        import json
-        from datetime import datetime
-        
-        project.rating_score = score_result["final_score"]
-        project.rating_algorithm = request.algorithm
-        project.rating_breakdown = json.dumps(score_result["breakdown"])
-        project.rating_recommendations = json.dumps(score_result["recommendations"])
-        project.rating_calculated_at = datetime.utcnow()
-        
-        db.commit()
+        # 项目更新和评分日志在同一个事务中提交，异常时自动回滚
+        async with db.begin():
+            # 获取项目信息
+            result = await db.execute(select(Project).where(Project.id == request.project_id))
+            project = result.scalar_one_or_none()
+            if not project:
+                raise HTTPException(status_code=404, detail="项目不存在")
+            
+            # 转换为字典格式
+            project_data = project.to_dict()
+            
+            # 使用简化算法评分
+            algorithm = SimpleScoringAlgorithm()
+            score_result = algorithm.calculate_score(project_data)
+            
+            # 更新项目评分信息
+            calculated_at = datetime.utcnow()
+            
+            # 明细和建议只序列化一次，项目和日志共用
+            breakdown_json = orjson.dumps(score_result["breakdown"]).decode()
+            recommendations_json = orjson.dumps(score_result["recommendations"]).decode()
+            
+            await db.execute(
+                update(Project)
+                .where(Project.id == request.project_id)
+                .values(
+                    rating_score=score_result["final_score"],
+                    rating_algorithm=request.algorithm,
+                    rating_breakdown=breakdown_json,
+                    rating_recommendations=recommendations_json,
+                    rating_calculated_at=calculated_at
+                )
+            )
+            
+            # 创建评分日志
+            scoring_log = ScoringLog(
+                project_id=request.project_id,
+                algorithm=request.algorithm,
+                score=score_result["final_score"],
+                breakdown=breakdown_json,
+                recommendations=recommendations_json
+            )
+            db.add(scoring_log)
         
-        # 创建评分日志
-        scoring_log = ScoringLog(
-            project_id=request.project_id,
-            algorithm=request.algorithm,
-            score=score_result["final_score"],
-            breakdown=json.dumps(score_result["breakdown"]),
-            recommendations=json.dumps(score_result["recommendations"])
-        )
-        db.add(scoring_log)
-        db.commit()
+        # 评分已更新，清除该项目的评分缓存
+        await _invalidate_rating_cache(request.project_id)
         
         # 返回评分结果
         return {
@@ -289,7 +325,7 @@ async def score_project(
             "final_score": score_result["final_score"],
             "breakdown": score_result["breakdown"],
             "recommendations": score_result["recommendations"],
-            "calculated_at": datetime.utcnow().isoformat()
+            "calculated_at": calculated_at.isoformat()
         }
         
     except HTTPException:
@@ -298,19 +334,20 @@ async def score_project(
         raise HTTPException(status_code=500, detail=f"评分失败: {str(e)}")
 
 @app.get("/projects/{project_id}/rating")
+@cache(expire=300, namespace=RATING_CACHE_NAMESPACE, key_builder=path_key_builder)
 async def get_project_rating(
     project_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """获取项目评分"""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    result = await db.execute(select(Project).where(Project.id == project_id))
+    project = result.scalar_one_or_none()
     if not project:
         raise HTTPException(status_code=404, detail="项目不存在")
     
     if not project.rating_score:
         raise HTTPException(status_code=404, detail="项目尚未评分")
     
-    import json
     rating_data = {
         "score": project.rating_score,
         "algorithm": project.rating_algorithm,
@@ -320,61 +357,77 @@ async def get_project_rating(
     # 解析详细评分
     try:
         if project.rating_breakdown:
-            rating_data["breakdown"] = json.loads(project.rating_breakdown)
+            rating_data["breakdown"] = orjson.loads(project.rating_breakdown)
         if project.rating_recommendations:
-            rating_data["recommendations"] = json.loads(project.rating_recommendations)
-    except json.JSONDecodeError:
+            rating_data["recommendations"] = orjson.loads(project.rating_recommendations)
+    except orjson.JSONDecodeError:
         pass
     
     return rating_data
 
+# 示例项目数据（预先序列化）
+_EXAMPLES = [
+    {
+        "name": "OpenClaw智能助手",
+        "description": "基于OpenClaw的AI个人助手系统",
+        "code_language": "Python",
+        "framework": "FastAPI",
+        "estimated_complexity": "中等",
+        "has_documentation": True,
+        "has_tests": True,
+        "has_ci_cd": True,
+        "team_size": 5
+    },
+    {
+        "name": "电商数据分析平台",
+        "description": "大数据分析平台，支持用户行为分析和销售预测",
+        "code_language": "Java",
+        "framework": "Spring Boot",
+        "estimated_complexity": "高",
+        "has_documentation": True,
+        "has_tests": True,
+        "has_ci_cd": True,
+        "team_size": 10
+    },
+    {
+        "name": "个人博客系统",
+        "description": "简单的个人博客系统",
+        "code_language": "JavaScript",
+        "framework": "React + Node.js",
+        "estimated_complexity": "低",
+        "has_documentation": False,
+        "has_tests": False,
+        "has_ci_cd": False,
+        "team_size": 1
+    }
+]
+_EXAMPLES_BYTES = orjson.dumps({"examples": _EXAMPLES})
+
 # 示例数据端点
 @app.get("/examples")
 async def get_examples():
     """获取示例项目数据"""
-    examples = [
-        {
-            "name": "OpenClaw智能助手",
-            "description": "基于OpenClaw的AI个人助手系统",
-            "code_language": "Python",
-            "framework": "FastAPI",
-            "estimated_complexity": "中等",
-            "has_documentation": True,
-            "has_tests": True,
-            "has_ci_cd": True,
-            "team_size": 5
-        },
-        {
-            "name": "电商数据分析平台",
-            "description": "大数据分析平台，支持用户行为分析和销售预测",
-            "code_language": "Java",
-            "framework": "Spring Boot",
-            "estimated_complexity": "高",
-            "has_documentation": True,
-            "has_tests": True,
-            "has_ci_cd": True,
-            "team_size": 10
-        },
-        {
-            "name": "个人博客系统",
-            "description": "简单的个人博客系统",
-            "code_language": "JavaScript",
-            "framework": "React + Node.js",
-            "estimated_complexity": "低",
-            "has_documentation": False,
-            "has_tests": False,
-            "has_ci_cd": False,
-            "team_size": 1
-        }
-    ]
-    return {"examples": examples}
+    return Response(content=_EXAMPLES_BYTES, media_type="application/json")
 
 if __name__ == "__main__":
     # 直接运行时启动服务器
     print(f"启动 {settings.APP_NAME}...")
+    
+    # uvloop在Windows上不可用，回退到默认事件循环
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "auto"
+    
     uvicorn.run(
         "app_cloud:app",
         host="0.0.0.0",
         port=int(os.getenv("PORT", 8000)),
-        reload=settings.DEBUG
+        reload=settings.DEBUG,
+        workers=int(os.getenv("WORKERS", 1)) if not settings.DEBUG else 1,
+        loop=loop,
+        http="httptools",
+        limit_concurrency=1000,
+        timeout_keep_alive=30
     )
\ No newline at end of file
@@ -2,21 +2,75 @@
 import os
 import sys
 import json
+import uuid
+import asyncio
+import orjson
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from collections import defaultdict
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 import uvicorn
 
+# 添加项目根目录到Python路径（在backend目录下直接运行时也能导入backend包）
+sys.path.append(str(Path(__file__).parent.parent))
+from backend.simple_scoring import SimpleScoringAlgorithm
+
+# 固定内容的响应在导入时预先序列化
+_ROOT_BYTES = orjson.dumps({
+    "message": "欢迎使用项目识别智能评分系统",
+    "version": "1.0.0",
+    "docs": "/docs",
+    "health": "/health",
+    "api": "/api",
+    "endpoints": [
+        "/projects",
+        "/analyze/score",
+        "/projects/{id}/rating"
+    ]
+})
+
+def _build_health_bytes() -> bytes:
+    """按当前时间戳生成健康检查响应"""
+    return orjson.dumps({
+        "status": "healthy",
+        "version": "1.0.0",
+        "timestamp": datetime.now().isoformat(),
+        "database": "in-memory",
+        "message": "系统运行正常"
+    })
+
+# 健康检查响应缓存（由后台任务定期刷新）
+HEALTH_CACHE_BYTES = _build_health_bytes()
+
+async def _tick_health_timestamp():
+    """每500毫秒刷新一次健康检查响应"""
+    global HEALTH_CACHE_BYTES
+    while True:
+        HEALTH_CACHE_BYTES = _build_health_bytes()
+        await asyncio.sleep(0.5)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期管理"""
+    ticker = asyncio.create_task(_tick_health_timestamp())
+    yield
+    ticker.cancel()
+
 # 创建FastAPI应用
 app = FastAPI(
     title="项目识别智能评分系统",
     description="基于AI的项目识别与智能评分系统（云端部署版）",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # 添加CORS中间件
@@ -28,75 +82,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 添加GZip压缩中间件（项目列表、示例数据等较大的响应）
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
 # 简单的内存数据库（用于演示）
 projects_db = {}
 analyses_db = {}
 scores_db = {}
 
-# 简化的评分算法
-class SimpleScoringAlgorithm:
-    """简化的评分算法"""
-    
-    @staticmethod
-    def calculate_score(project_data: Dict[str, Any]) -> Dict[str, Any]:
-        """计算项目评分"""
-        
-        # 基础评分逻辑
-        score = 50.0  # 基础分
-        
-        # 根据项目特征调整分数
-        if project_data.get("has_documentation", False):
-            score += 10
-        if project_data.get("has_tests", False):
-            score += 15
-        if project_data.get("has_ci_cd", False):
-            score += 10
-            
-        # 根据团队规模调整
-        team_size = project_data.get("team_size", 1)
-        if team_size > 5:
-            score += 5
-        elif team_size > 10:
-            score += 10
-            
-        # 根据复杂度调整
-        complexity = project_data.get("estimated_complexity", "低")
-        if complexity == "中等":
-            score += 5
-        elif complexity == "高":
-            score += 10
-            
-        # 确保分数在0-100之间
-        score = max(0, min(100, score))
-        
-        # 生成详细评分
-        breakdown = {
-            "基础分": 50.0,
-            "文档完整性": 10 if project_data.get("has_documentation") else 0,
-            "测试覆盖": 15 if project_data.get("has_tests") else 0,
-            "CI/CD": 10 if project_data.get("has_ci_cd") else 0,
-            "团队规模": min(10, (team_size - 1) * 2),
-            "项目复杂度": {
-                "低": 0,
-                "中等": 5,
-                "高": 10
-            }.get(complexity, 0)
-        }
-        
-        # 生成建议
-        recommendations = []
-        if not project_data.get("has_documentation", False):
-            recommendations.append("建议添加项目文档")
-        if not project_data.get("has_tests", False):
-            recommendations.append("建议添加单元测试")
-        if not project_data.get("has_ci_cd", False):
-            recommendations.append("建议配置CI/CD流水线")
-            
-        return {
-            "final_score": round(score, 1),
-            "breakdown": breakdown,
-            "recommendations": recommendations[:3]  # 最多3条建议
-        }
+# 项目名称 -> 评分ID 二级索引（评分按项目名称归属到项目）
+project_scores_index: Dict[str, List[str]] = defaultdict(list)
+# 按项目名称累计的评分，用于O(1)计算平均分
+project_scores_sum: Dict[str, float] = defaultdict(float)
+project_scores_count: Dict[str, int] = defaultdict(int)
 
 # 项目模型
 class ProjectCreate:
@@ -110,29 +108,12 @@ class ProjectCreate:
 @app.get("/")
 async def root():
     """根目录"""
-    return {
-        "message": "欢迎使用项目识别智能评分系统",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "health": "/health",
-        "api": "/api",
-        "endpoints": [
-            "/projects",
-            "/analyze/score",
-            "/projects/{id}/rating"
-        ]
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
     """健康检查端点"""
-    return {
-        "status": "healthy",
-        "version": "1.0.0",
-        "timestamp": datetime.now().isoformat(),
-        "database": "in-memory",
-        "message": "系统运行正常"
-    }
+    return Response(content=HEALTH_CACHE_BYTES, media_type="application/json")
 
 @app.get("/api/projects")
 async def get_projects():
@@ -145,7 +126,8 @@ async def get_projects():
 @app.post("/api/projects")
 async def create_project(data: Dict[str, Any]):
     """创建新项目"""
-    project_id = f"proj_{int(datetime.now().timestamp())}"
+    project_id = f"proj_{uuid.uuid4().hex}"
+    now = datetime.now().isoformat()
     
     project = {
         "id": project_id,
@@ -153,8 +135,8 @@ async def create_project(data: Dict[str, Any]):
         "description": data.get("description", ""),
         "repo_url": data.get("repo_url", ""),
         "tags": data.get("tags", []),
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
+        "created_at": now,
+        "updated_at": now
     }
     
     projects_db[project_id] = project
@@ -173,19 +155,28 @@ async def get_project(project_id: str):
 async def analyze_and_score_project(data: Dict[str, Any]):
     """分析并评分项目"""
     project_data = data.get("project_data", {})
+    project_id = data.get("project_id")
     
     # 使用简化算法计算分数
     algorithm = SimpleScoringAlgorithm()
     score_result = algorithm.calculate_score(project_data)
     
     # 存储评分结果
-    score_id = f"score_{int(datetime.now().timestamp())}"
+    score_id = f"score_{uuid.uuid4().hex}"
     scores_db[score_id] = {
         "id": score_id,
         "project_data": project_data,
         "score_result": score_result,
         "created_at": datetime.now().isoformat()
     }
+    # 评分按项目名称归属；请求体未带名称时按project_id取项目名称
+    project_name = project_data.get("name")
+    if project_name is None and isinstance(project_id, str) and project_id in projects_db:
+        project_name = projects_db[project_id]["name"]
+    if project_name is not None:
+        project_scores_index[project_name].append(score_id)
+        project_scores_sum[project_name] += score_result["final_score"]
+        project_scores_count[project_name] += 1
     
     return {
         "analysis_result": {
@@ -202,11 +193,10 @@ async def get_project_rating(project_id: str):
     if not project:
         raise HTTPException(status_code=404, detail="项目不存在")
     
-    # 查找该项目的评分
-    project_scores = []
-    for score_id, score_data in scores_db.items():
-        if score_data.get("project_data", {}).get("name") == project["name"]:
-            project_scores.append(score_data["score_result"])
+    # 通过索引查找该项目的评分
+    project_name = project["name"]
+    score_ids = project_scores_index.get(project_name, [])
+    project_scores = [scores_db[sid]["score_result"] for sid in score_ids]
     
     if not project_scores:
         # 如果没有评分，创建一个演示评分
@@ -220,12 +210,15 @@ async def get_project_rating(project_id: str):
             "estimated_complexity": "中等"
         }
         project_scores.append(algorithm.calculate_score(demo_data))
+        average_score = round(project_scores[0]["final_score"], 1)
+    else:
+        average_score = round(project_scores_sum[project_name] / project_scores_count[project_name], 1)
     
     return {
         "project_id": project_id,
         "project_name": project["name"],
         "ratings": project_scores,
-        "average_score": round(sum(s["final_score"] for s in project_scores) / len(project_scores), 1) if project_scores else 0
+        "average_score": average_score
     }
 
 @app.get("/api/demo")
@@ -262,6 +255,10 @@ async def demo():
         "score_result": score_result,
         "created_at": datetime.now().isoformat()
     }
+    if "demo_score" not in project_scores_index["demo_001"]:
+        project_scores_index["demo_001"].append("demo_score")
+        project_scores_sum["demo_001"] += score_result["final_score"]
+        project_scores_count["demo_001"] += 1
     
     return {
         "message": "演示数据已创建",
@@ -287,9 +284,22 @@ if __name__ == "__main__":
     print(f"健康检查: http://{host}:{port}/health")
     print(f"演示数据: http://{host}:{port}/api/demo")
     
+    # uvloop在Windows上不可用，回退到默认事件循环
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "auto"
+    
+    # 多进程模式下uvicorn需要以导入字符串的形式加载应用
     uvicorn.run(
-        app,
+        "app_simple:app",
         host=host,
         port=port,
-        log_level="info"
+        log_level="info",
+        workers=int(os.getenv("WORKERS", 1)),
+        loop=loop,
+        http="httptools",
+        limit_concurrency=1000,
+        timeout_keep_alive=30
     )
\ No newline at end of file
@@ -1,7 +1,7 @@
 # backend/config_cloud.py - 云端部署配置
 import os
 from typing import List, Optional
-from pydantic import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     """应用设置"""
@@ -26,6 +26,9 @@ class Settings(BaseSettings):
     # 数据库设置
     DATABASE_URL: str = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'projects.db')}")
     
+    # 缓存设置（未配置时使用进程内缓存）
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
+    
     # ML模型设置（云端简化版）
     ML_MODEL_PATH: str = os.path.join(os.path.dirname(__file__), "ml_models", "models")
     USE_SIMPLE_ALGORITHM: bool = True  # 云端使用简化算法
@@ -38,9 +41,7 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8天
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
 # 全局设置实例
 settings = Settings()
@@ -2,11 +2,15 @@
 数据库模块
 """
 
+import asyncio
 import logging
-from typing import Optional
+from typing import Optional, List, Tuple
+import orjson
+from sqlalchemy import text, insert
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base, sessionmaker
-import aioredis
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from redis.asyncio import Redis, BlockingConnectionPool
 from motor.motor_asyncio import AsyncIOMotorClient
 from config import settings
 
@@ -15,10 +19,35 @@ logger = logging.getLogger(__name__)
 # SQLAlchemy基类
 Base = declarative_base()
 
+# 连接池大小
+DB_POOL_SIZE = 20
+DB_MAX_OVERFLOW = 10
+
+# 限制同时持有数据库会话的请求数，超出连接池容量的请求在应用内排队，而不是等待连接池超时
+DB_SEMAPHORE = asyncio.Semaphore(DB_POOL_SIZE + DB_MAX_OVERFLOW)
+
 # 数据库引擎
 async_engine = None
 AsyncSessionLocal = None
 
+# 评分历史批量写入队列
+SCORE_WRITE_BATCH_SIZE = 500
+SCORING_HISTORY_COLUMNS = (
+    "project_id",
+    "quality_score",
+    "innovation_score",
+    "feasibility_score",
+    "business_value_score",
+    "overall_score",
+    "scoring_details",
+    "algorithm_version",
+)
+SCORE_WRITE_RETRY_DELAY = 1.0  # 写入失败后，无新数据时等待多久再重试（秒）
+_STOP_SCORE_WRITER = object()  # 队列哨兵：写入任务写完之前入队的数据后退出
+score_write_queue = None
+score_writer_task = None
+_direct_score_writes = set()  # 写入任务未运行时直接写入的任务引用
+
 # Redis连接
 redis_client = None
 
@@ -36,12 +65,16 @@ async def init_db():
         async_engine = create_async_engine(
             settings.DATABASE_URL,
             echo=settings.DEBUG,
-            pool_size=10,
-            max_overflow=20,
-            pool_pre_ping=True,
-            pool_recycle=3600,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_pre_ping=False,  # 不在每次取连接时额外执行SELECT 1，依靠较短的回收周期淘汰旧连接
+            pool_recycle=300,
         )
         
+        # 预热连接池，首个请求无需等待建立连接和认证
+        await _warmup_pool(async_engine, DB_POOL_SIZE)
+        
         AsyncSessionLocal = async_sessionmaker(
             bind=async_engine,
             class_=AsyncSession,
@@ -52,13 +85,19 @@ async def init_db():
         
         logger.info("PostgreSQL连接已建立")
         
+        # 评分历史后台批量写入
+        start_score_writer()
+        
         # Redis初始化
-        redis_client = await aioredis.from_url(
+        # 有界阻塞连接池：连接用尽时等待空闲连接，而不是新建socket
+        redis_pool = BlockingConnectionPool.from_url(
             settings.REDIS_URL,
             encoding="utf-8",
             decode_responses=True,
-            max_connections=10
+            max_connections=32,
+            timeout=5
         )
+        redis_client = Redis(connection_pool=redis_pool)
         
         logger.info("Redis连接已建立")
         
@@ -73,24 +112,151 @@ async def init_db():
         raise
 
 
+async def _warmup_pool(engine, size: int):
+    """同时打开size个连接并执行一次查询，使连接池在启动时填满"""
+    conns = await asyncio.gather(*(engine.connect() for _ in range(size)))
+    try:
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in conns))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in conns))
+    logger.info(f"数据库连接池已预热: {size}个连接")
+
+
 async def get_db() -> AsyncSession:
     """获取数据库会话"""
     if AsyncSessionLocal is None:
         raise RuntimeError("数据库未初始化")
     
-    async with AsyncSessionLocal() as session:
+    # 不在请求结束时自动提交：只读请求不产生写事务，写操作由路由显式commit
+    async with DB_SEMAPHORE:
+        async with AsyncSessionLocal() as session:
+            try:
+                yield session
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                await session.close()
+
+
+async def bulk_record_scores(rows: List[Tuple]):
+    """
+    批量写入评分历史
+    
+    asyncpg驱动下使用COPY一次性写入所有行，其他驱动退回到executemany。
+    每行字段顺序与SCORING_HISTORY_COLUMNS一致。
+    """
+    if not rows:
+        return
+    
+    async with async_engine.connect() as conn:
+        if async_engine.dialect.driver == "asyncpg":
+            raw = await conn.get_raw_connection()
+            records = [
+                row[:6] + (orjson.dumps(row[6]).decode() if row[6] is not None else None, row[7])
+                for row in rows
+            ]
+            await raw.driver_connection.copy_records_to_table(
+                ScoringHistory.__tablename__,
+                records=records,
+                columns=SCORING_HISTORY_COLUMNS
+            )
+        else:
+            await conn.execute(
+                insert(ScoringHistory),
+                [dict(zip(SCORING_HISTORY_COLUMNS, row)) for row in rows]
+            )
+            await conn.commit()
+
+
+def record_score(row: Tuple):
+    """评分历史入队，由后台任务批量写入；写入任务未运行时直接写入"""
+    if score_writer_task is not None and not score_writer_task.done():
+        score_write_queue.put_nowait(row)
+    else:
+        task = asyncio.get_running_loop().create_task(bulk_record_scores([row]))
+        _direct_score_writes.add(task)
+        task.add_done_callback(_direct_score_writes.discard)
+
+
+async def _flush_scores():
+    """后台写入任务：取出队列中积压的评分历史，合并为一次写入；写入失败的批次保留到下一轮重试"""
+    retry = []
+    while True:
+        if retry:
+            # 有待重试的数据时不无限等待新数据
+            try:
+                row = await asyncio.wait_for(score_write_queue.get(), SCORE_WRITE_RETRY_DELAY)
+            except asyncio.TimeoutError:
+                row = None
+        else:
+            row = await score_write_queue.get()
+        
+        batch, retry = retry, []
+        stopping = row is _STOP_SCORE_WRITER
+        if row is not None and not stopping:
+            batch.append(row)
+        while not stopping and len(batch) < SCORE_WRITE_BATCH_SIZE and not score_write_queue.empty():
+            row = score_write_queue.get_nowait()
+            if row is _STOP_SCORE_WRITER:
+                stopping = True
+            else:
+                batch.append(row)
+        
+        try:
+            await bulk_record_scores(batch)
+        except Exception as e:
+            if stopping:
+                logger.error(f"评分历史批量写入失败，丢弃{len(batch)}条: {e}")
+            else:
+                logger.error(f"评分历史批量写入失败，稍后重试{len(batch)}条: {e}")
+                retry = batch
+        
+        if stopping:
+            return
+
+
+def start_score_writer():
+    """启动评分历史后台写入任务"""
+    global score_write_queue, score_writer_task
+    
+    if score_writer_task is None or score_writer_task.done():
+        score_write_queue = asyncio.Queue()
+        score_writer_task = asyncio.create_task(_flush_scores())
+
+
+async def stop_score_writer():
+    """停止后台写入任务，并等待队列中剩余的评分历史写入完成"""
+    global score_writer_task
+    
+    task, score_writer_task = score_writer_task, None
+    if task is not None:
+        # 之后的record_score走直接写入；哨兵之前入队的数据由写入任务写完
+        if not task.done():
+            score_write_queue.put_nowait(_STOP_SCORE_WRITER)
         try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+            await task
+        except Exception as e:
+            logger.error(f"评分历史写入任务异常退出: {e}")
+        
+        # 写入任务异常退出时队列中可能仍有数据
+        pending = []
+        while not score_write_queue.empty():
+            row = score_write_queue.get_nowait()
+            if row is not _STOP_SCORE_WRITER:
+                pending.append(row)
+        await bulk_record_scores(pending)
+    
+    # 等待写入任务未运行期间直接发起的写入
+    if _direct_score_writes:
+        results = await asyncio.gather(*_direct_score_writes, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"评分历史写入失败: {result}")
 
 
-async def get_redis():
-    """获取Redis连接"""
+def get_redis():
+    """获取Redis连接（返回已初始化的全局客户端，无需await）"""
     if redis_client is None:
         raise RuntimeError("Redis未初始化")
     return redis_client
@@ -108,12 +274,15 @@ async def close_db():
     global async_engine, redis_client, mongo_client
     
     try:
+        await stop_score_writer()
+        
         if async_engine:
             await async_engine.dispose()
             logger.info("PostgreSQL连接已关闭")
         
         if redis_client:
             await redis_client.close()
+            await redis_client.connection_pool.disconnect()
             logger.info("Redis连接已关闭")
         
         if mongo_client:
@@ -125,7 +294,7 @@ async def close_db():
 
 
 # 数据库模型
-from sqlalchemy import Column, Integer, String, Float, Text, JSON, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Text, JSON, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.sql import func
 
 
@@ -138,7 +307,8 @@ class Project(Base):
     description = Column(Text, nullable=True)
     category = Column(String(100), nullable=True, index=True)
     tech_stack = Column(JSON, nullable=True)  # 技术栈列表
-    metadata = Column(JSON, nullable=True)    # 额外元数据
+    # 属性名不能用metadata（与Base.metadata冲突），数据库列名保持为metadata
+    extra_metadata = Column("metadata", JSON, nullable=True)    # 额外元数据
     
     # 评分相关字段
     quality_score = Column(Float, nullable=True)
@@ -148,15 +318,20 @@ class Project(Base):
     overall_score = Column(Float, nullable=True, index=True)
     
     # 状态和时间
-    status = Column(String(50), default="pending", index=True)  # pending, analyzing, scored, archived
+    status = Column(String(50), default="pending")  # pending, analyzing, scored, archived
     analysis_result = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     analyzed_at = Column(DateTime(timezone=True), nullable=True)
     
-    # 索引
+    # 索引：按状态筛选并按综合评分排序的覆盖索引（PostgreSQL可走仅索引扫描）
     __table_args__ = (
-        {"postgresql_include": ["name", "category"]},
+        Index(
+            "ix_projects_status_score",
+            "status",
+            "overall_score",
+            postgresql_include=["name", "category"]
+        ),
     )
 
 
@@ -165,7 +340,7 @@ class ScoringHistory(Base):
     __tablename__ = "scoring_history"
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     
     # 各项评分
     quality_score = Column(Float, nullable=False)
@@ -180,9 +355,14 @@ class ScoringHistory(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
-    # 索引
+    # 索引：按项目查询最新评分的覆盖索引
     __table_args__ = (
-        {"postgresql_include": ["project_id", "overall_score"]},
+        Index(
+            "ix_sh_proj_created",
+            "project_id",
+            "created_at",
+            postgresql_include=["overall_score"]
+        ),
     )
 
 
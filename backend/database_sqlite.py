@@ -1,9 +1,21 @@
 # backend/database_sqlite.py - 简化的SQLite数据库模块（云端部署版）
 import os
+import logging
 import sqlite3
+import threading
+import orjson
+from contextlib import contextmanager
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from functools import lru_cache
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from config_cloud import settings
+
+logger = logging.getLogger(__name__)
 
 # 数据库文件路径
 DB_PATH = os.path.join(os.path.dirname(__file__), "database", "projects.db")
@@ -12,20 +24,65 @@ DB_DIR = os.path.join(os.path.dirname(__file__), "database")
 # 确保数据库目录存在
 os.makedirs(DB_DIR, exist_ok=True)
 
+# 每个新连接执行一次的PRAGMA（WAL模式允许写入时并发读取）
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
 class SQLiteDatabase:
     """简化的SQLite数据库操作类"""
     
     def __init__(self, db_path: str = DB_PATH):
         self.db_path = db_path
+        self._local = threading.local()
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """打开新连接并应用PRAGMA"""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            detect_types=0,         # 不启用类型转换器，时间列按字符串读写
+            timeout=5.0,            # 库被锁定时在C层等待，而不是立即报错
+            cached_statements=256   # 预编译语句缓存，持久连接上重复的SQL无需重新解析
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def _conn(self) -> sqlite3.Connection:
+        """获取当前线程的持久连接（fork后的子进程重新打开）"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+    
+    @contextmanager
+    def _transaction(self):
+        """写事务：BEGIN IMMEDIATE ... COMMIT，异常时回滚"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
     def _init_database(self):
         """初始化数据库表"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # 使用临时连接建表，避免持久连接在导入阶段创建后被fork继承
+        conn = self._connect()
         
         # 创建项目表
-        cursor.execute('''
+        conn.execute('''
         CREATE TABLE IF NOT EXISTS projects (
             id TEXT PRIMARY KEY,
             name TEXT NOT NULL,
@@ -38,7 +95,7 @@ class SQLiteDatabase:
         ''')
         
         # 创建项目分析表
-        cursor.execute('''
+        conn.execute('''
         CREATE TABLE IF NOT EXISTS project_analysis (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             project_id TEXT NOT NULL,
@@ -50,7 +107,7 @@ class SQLiteDatabase:
         ''')
         
         # 创建评分日志表
-        cursor.execute('''
+        conn.execute('''
         CREATE TABLE IF NOT EXISTS scoring_logs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             project_id TEXT NOT NULL,
@@ -62,41 +119,33 @@ class SQLiteDatabase:
         )
         ''')
         
-        conn.commit()
         conn.close()
     
     def create_project(self, project_data: Dict[str, Any]) -> str:
         """创建新项目"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        now = datetime.now()
+        project_id = project_data.get('id') or f"proj_{now.timestamp()}"
+        now_str = now.isoformat(" ")
         
-        project_id = project_data.get('id') or f"proj_{datetime.now().timestamp()}"
+        with self._transaction() as conn:
+            conn.execute('''
+            INSERT INTO projects (id, name, description, repo_url, tags, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                project_id,
+                project_data.get('name', ''),
+                project_data.get('description', ''),
+                project_data.get('repo_url', ''),
+                ','.join(project_data.get('tags', [])),
+                now_str,
+                now_str
+            ))
         
-        cursor.execute('''
-        INSERT INTO projects (id, name, description, repo_url, tags, created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            project_id,
-            project_data.get('name', ''),
-            project_data.get('description', ''),
-            project_data.get('repo_url', ''),
-            ','.join(project_data.get('tags', [])),
-            datetime.now(),
-            datetime.now()
-        ))
-        
-        conn.commit()
-        conn.close()
         return project_id
     
     def get_project(self, project_id: str) -> Optional[Dict[str, Any]]:
         """获取项目信息"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM projects WHERE id = ?', (project_id,))
-        row = cursor.fetchone()
+        row = self._conn().execute('SELECT * FROM projects WHERE id = ?', (project_id,)).fetchone()
         
         if row:
             project = dict(row)
@@ -105,61 +154,51 @@ class SQLiteDatabase:
                 project['tags'] = project['tags'].split(',')
             else:
                 project['tags'] = []
-            conn.close()
             return project
         
-        conn.close()
         return None
     
     def update_project_rating(self, project_id: str, rating_data: Dict[str, Any]) -> bool:
         """更新项目评分（简化版，实际存储到评分日志表）"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # 将评分数据存储到scoring_logs表
-        cursor.execute('''
-        INSERT INTO scoring_logs (project_id, algorithm_type, score, score_breakdown)
-        VALUES (?, ?, ?, ?)
-        ''', (
-            project_id,
-            rating_data.get('algorithm_type', 'simple'),
-            rating_data.get('overall_score', 0.0),
-            json.dumps(rating_data) if rating_data else '{}'
-        ))
+        now = datetime.now().isoformat(" ")
         
-        # 更新项目表的updated_at时间
-        cursor.execute('''
-        UPDATE projects SET updated_at = ? WHERE id = ?
-        ''', (datetime.now(), project_id))
+        # 评分日志写入与项目时间更新在同一个事务中提交
+        with self._transaction() as conn:
+            # 将评分数据存储到scoring_logs表
+            conn.execute('''
+            INSERT INTO scoring_logs (project_id, algorithm_type, score, score_breakdown)
+            VALUES (?, ?, ?, ?)
+            ''', (
+                project_id,
+                rating_data.get('algorithm_type', 'simple'),
+                rating_data.get('overall_score', 0.0),
+                json_dumps(rating_data) if rating_data else '{}'
+            ))
+            
+            # 更新项目表的updated_at时间
+            conn.execute('''
+            UPDATE projects SET updated_at = ? WHERE id = ?
+            ''', (now, project_id))
         
-        conn.commit()
-        conn.close()
         return True
     
     def get_project_rating(self, project_id: str) -> Optional[Dict[str, Any]]:
         """获取项目最新评分"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        row = self._conn().execute('''
         SELECT * FROM scoring_logs 
         WHERE project_id = ? 
         ORDER BY created_at DESC 
         LIMIT 1
-        ''', (project_id,))
-        
-        row = cursor.fetchone()
-        conn.close()
+        ''', (project_id,)).fetchone()
         
         if row:
             # 解析JSON格式的score_breakdown
-            import json
             rating_data = {
                 'id': row[0],
                 'project_id': row[1],
                 'algorithm_type': row[2],
                 'score': row[3],
-                'score_breakdown': json.loads(row[4]) if row[4] else {},
+                'score_breakdown': json_loads(row[4]),
                 'created_at': row[5]
             }
             return rating_data
@@ -168,12 +207,7 @@ class SQLiteDatabase:
     
     def list_projects(self, limit: int = 100) -> List[Dict[str, Any]]:
         """列出所有项目"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM projects ORDER BY created_at DESC LIMIT ?', (limit,))
-        rows = cursor.fetchall()
+        rows = self._conn().execute('SELECT * FROM projects ORDER BY created_at DESC LIMIT ?', (limit,)).fetchall()
         
         projects = []
         for row in rows:
@@ -184,37 +218,137 @@ class SQLiteDatabase:
                 project['tags'] = []
             projects.append(project)
         
-        conn.close()
         return projects
 
 # 全局数据库实例
 db_instance = SQLiteDatabase()
 
 # FastAPI依赖函数
-def get_db():
+def get_sqlite_db():
     """获取数据库连接（FastAPI依赖）"""
     return db_instance
 
-# SQLAlchemy兼容的模型类（简化版）
-class Project:
+# SQLAlchemy异步引擎（云端版应用使用，库文件由settings.DATABASE_URL指定）
+def _to_async_url(url: str) -> str:
+    """把同步数据库URL转换为异步驱动URL"""
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    return url
+
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """获取异步引擎（每个进程只创建一次，复用连接池）"""
+    # aiosqlite默认使用NullPool（每次都新建连接），这里显式启用连接池
+    return create_async_engine(
+        _to_async_url(settings.DATABASE_URL),
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    )
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> async_sessionmaker:
+    """获取绑定到共享引擎的会话工厂"""
+    return async_sessionmaker(
+        bind=get_engine(),
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+Base = declarative_base()
+
+async def init_models():
+    """创建SQLAlchemy模型对应的表"""
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+async def close_db():
+    """释放引擎的连接池"""
+    await get_engine().dispose()
+
+async def get_db() -> AsyncSession:
+    """获取异步数据库会话（FastAPI依赖）"""
+    async with get_sessionmaker()() as session:
+        yield session
+
+# SQLAlchemy模型类（简化版）
+# 表名加cloud_前缀：默认DATABASE_URL与SQLiteDatabase共用同一个库文件，
+# 若同名，create_all会跳过已存在的旧结构表
+class Project(Base):
     """项目模型（简化版）"""
-    pass
+    __tablename__ = "cloud_projects"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    code_language = Column(String(100), nullable=True)
+    framework = Column(String(100), nullable=True)
+    git_url = Column(String(500), nullable=True)
+    estimated_complexity = Column(String(50), nullable=True)
+    estimated_development_time = Column(String(100), nullable=True)
+    team_size = Column(Integer, nullable=True)
+    has_documentation = Column(Boolean, default=False)
+    has_tests = Column(Boolean, default=False)
+    has_ci_cd = Column(Boolean, default=False)
+    
+    # 评分相关字段
+    rating_score = Column(Float, nullable=True)
+    rating_algorithm = Column(String(50), nullable=True)
+    rating_breakdown = Column(Text, nullable=True)  # JSON格式的分数明细
+    rating_recommendations = Column(Text, nullable=True)  # JSON格式的建议
+    rating_calculated_at = Column(DateTime, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "code_language": self.code_language,
+            "framework": self.framework,
+            "git_url": self.git_url,
+            "estimated_complexity": self.estimated_complexity,
+            "estimated_development_time": self.estimated_development_time,
+            "team_size": self.team_size,
+            "has_documentation": bool(self.has_documentation),
+            "has_tests": bool(self.has_tests),
+            "has_ci_cd": bool(self.has_ci_cd),
+            "created_at": self.created_at.isoformat() if self.created_at else "",
+            "updated_at": self.updated_at.isoformat() if self.updated_at else "",
+        }
 
-class ProjectAnalysis:
+class ProjectAnalysis(Base):
     """项目分析模型（简化版）"""
-    pass
+    __tablename__ = "cloud_project_analysis"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("cloud_projects.id"), nullable=False, index=True)
+    analysis_type = Column(String(50), nullable=False)
+    analysis_data = Column(Text, nullable=True)  # JSON格式的分析数据
+    created_at = Column(DateTime, default=datetime.utcnow)
 
-class ScoringLog:
+class ScoringLog(Base):
     """评分日志模型（简化版）"""
-    pass
+    __tablename__ = "cloud_scoring_logs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("cloud_projects.id"), nullable=False, index=True)
+    algorithm = Column(String(50), nullable=False)
+    score = Column(Float, nullable=False)
+    breakdown = Column(Text, nullable=True)  # JSON格式的分数明细
+    recommendations = Column(Text, nullable=True)  # JSON格式的建议
+    created_at = Column(DateTime, default=datetime.utcnow)
 
 # 辅助函数
 def json_dumps(data: Any) -> str:
     """JSON序列化辅助函数"""
-    import json
-    return json.dumps(data, ensure_ascii=False, default=str)
+    return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
 
 def json_loads(data: str) -> Any:
     """JSON反序列化辅助函数"""
-    import json
-    return json.loads(data) if data else {}
\ No newline at end of file
+    return orjson.loads(data) if data else {}
\ No newline at end of file
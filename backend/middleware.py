@@ -2,200 +2,233 @@
 中间件模块
 """
 
+import hmac
 import time
+import uuid
 import logging
-from typing import Dict, Any
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
-import aioredis
+from typing import Dict, Any, Optional
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from config import settings
+from .database import get_redis
 
 logger = logging.getLogger(__name__)
 
+# 各中间件跳过的路径（集合查找，避免每次请求构建列表）
+_LOGGING_SKIP = frozenset({"/health"})
+_RATE_LIMIT_SKIP = frozenset({"/health", "/docs", "/redoc", "/openapi.json"})
+_AUTH_PUBLIC = frozenset({"/", "/health", "/docs", "/redoc", "/openapi.json", "/api/info"})
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """日志中间件"""
+# 有效的API密钥（示例，实际应从数据库或配置中加载）
+_VALID_KEYS = frozenset({b"test-key-123", b"dev-key-456"})
+
+def _get_header(scope: Scope, name: bytes) -> Optional[bytes]:
+    """在原始请求头中查找（ASGI请求头名已是小写bytes，无需解码和大小写转换）"""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+# 速率限制计数脚本：INCR与EXPIRE在Redis端原子执行，只需一次往返
+RATE_LIMIT_LUA = """
+local v = redis.call('INCR', KEYS[1])
+if v == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return v
+"""
+
+
+class LoggingMiddleware:
+    """日志中间件（纯ASGI实现，不为每个请求额外创建任务和内存流）"""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        # 跳过健康检查的详细日志
+        path = scope["path"]
+        if path in _LOGGING_SKIP:
+            return await self.app(scope, receive, send)
+        
         # 记录请求开始
-        start_time = time.time()
+        start_time = time.perf_counter()
+        method = scope["method"]
         
         # 获取客户端信息
-        client_host = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("user-agent", "")
+        client = scope.get("client")
+        client_host = client[0] if client else "unknown"
         
-        # 跳过健康检查的详细日志
-        if request.url.path == "/health":
-            response = await call_next(request)
-            return response
+        logger.info(f"请求开始: {method} {path} from {client_host}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("请求头: %s", scope["headers"])
         
-        logger.info(f"请求开始: {request.method} {request.url.path} from {client_host}")
-        logger.debug(f"请求头: {dict(request.headers)}")
+        status_code = 500
+        
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # 添加响应头
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", str(time.perf_counter() - start_time))
+                headers.append("X-Server", settings.APP_NAME)
+            await send(message)
         
         try:
             # 处理请求
-            response = await call_next(request)
-            
-            # 计算处理时间
-            process_time = time.time() - start_time
-            
-            # 记录响应信息
-            logger.info(
-                f"请求完成: {request.method} {request.url.path} "
-                f"status={response.status_code} time={process_time:.3f}s"
-            )
-            
-            # 添加响应头
-            response.headers["X-Process-Time"] = str(process_time)
-            response.headers["X-Server"] = settings.APP_NAME
-            
-            return response
-            
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
-            process_time = time.time() - start_time
+            process_time = time.perf_counter() - start_time
             logger.error(
-                f"请求异常: {request.method} {request.url.path} "
+                f"请求异常: {method} {path} "
                 f"error={exc} time={process_time:.3f}s"
             )
             raise
+        
+        # 记录响应信息
+        process_time = time.perf_counter() - start_time
+        logger.info(
+            f"请求完成: {method} {path} "
+            f"status={status_code} time={process_time:.3f}s"
+        )
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """速率限制中间件"""
+class RateLimitMiddleware:
+    """速率限制中间件（纯ASGI实现）"""
     
-    def __init__(self, app, requests_per_minute: int = 60):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, requests_per_minute: int = 60):
+        self.app = app
         self.requests_per_minute = requests_per_minute
+        self._limit_str = str(requests_per_minute)
         self.redis_client = None
+        self._incr_script = None
+    
+    def _bind_redis(self):
+        """绑定Redis客户端并注册计数脚本（同步执行，并发请求间不会交错）"""
+        try:
+            self.redis_client = get_redis()
+        except RuntimeError:
+            return None
+        # 注册脚本后以EVALSHA调用，脚本缓存丢失时自动回退到EVAL
+        self._incr_script = self.redis_client.register_script(RATE_LIMIT_LUA)
+        return self._incr_script
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         # 跳过某些路径的速率限制
-        if request.url.path in ["/health", "/docs", "/redoc", "/openapi.json"]:
-            return await call_next(request)
-        
-        # 初始化Redis连接
-        if self.redis_client is None:
-            from .database import get_redis
-            try:
-                self.redis_client = await get_redis()
-            except Exception:
-                logger.warning("Redis不可用，跳过速率限制")
-                return await call_next(request)
+        if scope["type"] != "http" or scope["path"] in _RATE_LIMIT_SKIP:
+            return await self.app(scope, receive, send)
+        
+        # 首次请求时绑定Redis连接
+        incr_script = self._incr_script or self._bind_redis()
+        if incr_script is None:
+            logger.warning("Redis不可用，跳过速率限制")
+            return await self.app(scope, receive, send)
         
         # 获取客户端IP
-        client_ip = request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
         
-        # 构建Redis键
-        key = f"rate_limit:{client_ip}:{int(time.time() / 60)}"
+        # 构建Redis键（当前分钟窗口及其结束时间）
+        now = int(time.time())
+        bucket = now // 60
+        reset = (bucket + 1) * 60
+        key = f"rate_limit:{client_ip}:{bucket}"
         
         try:
-            # 增加计数器
-            current_count = await self.redis_client.incr(key)
-            
-            # 如果是新键，设置过期时间
-            if current_count == 1:
-                await self.redis_client.expire(key, 61)  # 61秒确保跨分钟
-            
-            # 检查是否超过限制
-            if current_count > self.requests_per_minute:
-                logger.warning(f"速率限制: IP {client_ip} 超过限制")
-                raise HTTPException(
-                    status_code=429,
-                    detail="请求过于频繁，请稍后再试"
-                )
-            
-            # 添加剩余请求数头部
-            response = await call_next(request)
-            response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-            response.headers["X-RateLimit-Remaining"] = str(self.requests_per_minute - current_count)
-            response.headers["X-RateLimit-Reset"] = str(int(time.time() / 60 + 1) * 60)
-            
-            return response
-            
-        except HTTPException:
-            raise
+            # 增加计数器，新键设置过期时间（61秒确保跨分钟）
+            current_count = int(await incr_script(keys=[key], args=[61]))
         except Exception as e:
             logger.error(f"速率限制中间件错误: {e}")
             # Redis出错时跳过速率限制
-            return await call_next(request)
+            return await self.app(scope, receive, send)
+        
+        # 检查是否超过限制
+        if current_count > self.requests_per_minute:
+            logger.warning(f"速率限制: IP {client_ip} 超过限制")
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "请求过于频繁，请稍后再试"},
+                headers={
+                    "Retry-After": str(reset - now),
+                    "X-RateLimit-Limit": self._limit_str,
+                    "X-RateLimit-Remaining": "0"
+                }
+            )
+            return await response(scope, receive, send)
+        
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                # 添加剩余请求数头部
+                headers = MutableHeaders(scope=message)
+                headers.append("X-RateLimit-Limit", self._limit_str)
+                headers.append("X-RateLimit-Remaining", str(self.requests_per_minute - current_count))
+                headers.append("X-RateLimit-Reset", str(reset))
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
 
 
-class AuthenticationMiddleware(BaseHTTPMiddleware):
-    """认证中间件（示例）"""
+class AuthenticationMiddleware:
+    """认证中间件（示例，纯ASGI实现）"""
     
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         # 跳过公开路径
-        public_paths = ["/", "/health", "/docs", "/redoc", "/openapi.json", "/api/info"]
-        if request.url.path in public_paths:
-            return await call_next(request)
+        if scope["type"] != "http" or scope["path"] in _AUTH_PUBLIC:
+            return await self.app(scope, receive, send)
         
         # 检查API密钥
-        api_key = request.headers.get("X-API-Key")
+        api_key = _get_header(scope, b"x-api-key")
         if not api_key:
             logger.warning("未提供API密钥")
-            raise HTTPException(
-                status_code=401,
-                detail="未提供API密钥"
-            )
+            response = JSONResponse(status_code=401, content={"detail": "未提供API密钥"})
+            return await response(scope, receive, send)
         
-        # 验证API密钥（这里应该从数据库或配置中验证）
-        # 实际应用中应使用更安全的验证方式
-        valid_keys = ["test-key-123", "dev-key-456"]  # 示例
-        if api_key not in valid_keys:
-            logger.warning(f"无效的API密钥: {api_key}")
-            raise HTTPException(
-                status_code=401,
-                detail="无效的API密钥"
-            )
+        # 验证API密钥（逐个做常量时间比较，避免时序侧信道）
+        if not any(hmac.compare_digest(api_key, key) for key in _VALID_KEYS):
+            logger.warning(f"无效的API密钥: {api_key.decode('latin-1')}")
+            response = JSONResponse(status_code=401, content={"detail": "无效的API密钥"})
+            return await response(scope, receive, send)
         
         # 将用户信息添加到请求状态
-        request.state.user = {"api_key": api_key, "role": "user"}
+        scope.setdefault("state", {})["user"] = {"api_key": api_key.decode("latin-1"), "role": "user"}
         
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """请求ID中间件"""
+class RequestIDMiddleware:
+    """请求ID中间件（纯ASGI实现）"""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
     
-    async def dispatch(self, request: Request, call_next):
-        import uuid
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
         
         # 生成请求ID
-        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        raw_request_id = _get_header(scope, b"x-request-id")
+        request_id = raw_request_id.decode("latin-1") if raw_request_id else uuid.uuid4().hex
         
         # 将请求ID添加到请求状态
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
         
-        # 处理请求
-        response = await call_next(request)
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                # 添加请求ID到响应头
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
         
-        # 添加请求ID到响应头
-        response.headers["X-Request-ID"] = request_id
-        
-        return response
-
-
-class CompressionMiddleware(BaseHTTPMiddleware):
-    """压缩中间件"""
-    
-    async def dispatch(self, request: Request, call_next):
-        # 检查客户端是否支持压缩
-        accept_encoding = request.headers.get("Accept-Encoding", "")
-        
-        response = await call_next(request)
-        
-        # 只压缩特定类型的内容
-        content_type = response.headers.get("Content-Type", "")
-        if "application/json" in content_type or "text/plain" in content_type:
-            # 检查响应大小
-            content_length = response.headers.get("Content-Length")
-            if content_length and int(content_length) > 1024:  # 大于1KB才压缩
-                # 这里可以添加实际的压缩逻辑
-                # 例如使用gzip或brotli
-                pass
-        
-        return response
+        await self.app(scope, receive, send_wrapper)
 
 
 # 中间件配置
@@ -221,8 +254,8 @@ MIDDLEWARE_CONFIG = {
         "class": RequestIDMiddleware
     },
     "compression": {
-        "enabled": False,  # 根据需求开启
-        "class": CompressionMiddleware,
-        "min_size": 1024  # 最小压缩大小
+        "enabled": False,  # app.py已直接注册GZipMiddleware
+        "class": GZipMiddleware,
+        "minimum_size": 1024  # 最小压缩大小
     }
 }
\ No newline at end of file
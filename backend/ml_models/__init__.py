@@ -2,18 +2,45 @@
 机器学习模型模块
 """
 
+import asyncio
+import copy
+import hashlib
+import importlib
 import logging
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Any, AsyncIterator, List, Optional, Set, Tuple
 import numpy as np
+import orjson
 from config import settings
 
+# diskcache为可选依赖，未安装时只使用内存缓存
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
 logger = logging.getLogger(__name__)
 
-# 导入各子模块
-from .project_classifier import ProjectClassifier
-from .tech_stack_analyzer import TechStackAnalyzer
-from .feature_extractor import FeatureExtractor
-from .nlp_processor import NLPProcessor
+# 模型类按需从子模块导入（子模块会连带导入sklearn、nltk等重量级依赖）
+_LAZY_CLASSES = {
+    "ProjectClassifier": ".project_classifier",
+    "TechStackAnalyzer": ".tech_stack_analyzer",
+    "FeatureExtractor": ".feature_extractor",
+    "NLPProcessor": ".nlp_processor"
+}
+
+
+def __getattr__(name: str):
+    """首次访问模型类时才导入对应子模块"""
+    module_name = _LAZY_CLASSES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 # 全局模型实例
 _project_classifier = None
@@ -21,14 +48,241 @@ _tech_stack_analyzer = None
 _feature_extractor = None
 _nlp_processor = None
 
+# 预热使用的示例项目
+_WARMUP_PROJECT = {
+    "name": "warmup",
+    "description": "A web application built with Python, FastAPI and React",
+    "tech_stack": ["python", "fastapi", "react"],
+    "metadata": {}
+}
+
+# 模型加载状态
+_load_lock: Optional[asyncio.Lock] = None
+_loaded = False
+
+# 分析结果缓存（按项目数据哈希的LRU，模型版本变化时整体失效）
+ANALYSIS_CACHE_SIZE = 4096
+_analysis_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_analysis_cache_versions: Optional[Tuple[str, ...]] = None
+
+
+# 分析结果磁盘缓存（进程重启后仍可命中，按需打开）
+_disk_cache = None
+
+# 特征提取与技术栈分析的中间结果缓存（只按影响这两个阶段的字段哈希）
+FEATURE_INPUT_KEYS = ("name", "description", "tech_stack", "metadata")
+STAGE_CACHE_SIZE = 8192
+_feature_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_tech_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# 评分进程池（按需创建）
+_scoring_pool: Optional[ProcessPoolExecutor] = None
+
+# 描述短于该长度或字母占比低于该比例时跳过NLP分析
+MIN_NLP_TEXT_LENGTH = 20
+MIN_NLP_LETTER_RATIO = 0.5
+
+# 微批处理参数：收集窗口（毫秒）与单批最大项目数
+BATCH_WINDOW_MS = 10
+MAX_BATCH = 32
+
+
+def _analysis_cache_key(project_data: Dict[str, Any]) -> str:
+    """项目数据的稳定哈希（键排序后序列化）"""
+    payload = orjson.dumps(
+        project_data,
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _current_model_versions() -> Tuple[str, ...]:
+    """当前已加载模型的版本"""
+    return (
+        _project_classifier.version,
+        _tech_stack_analyzer.version,
+        _feature_extractor.version,
+        _nlp_processor.version
+    )
+
+
+def _get_disk_cache():
+    """按需打开分析结果磁盘缓存；未安装diskcache或未配置目录时返回None"""
+    global _disk_cache
+    
+    if _disk_cache is None and diskcache is not None and settings.ANALYSIS_DISK_CACHE_DIR:
+        try:
+            _disk_cache = diskcache.Cache(
+                settings.ANALYSIS_DISK_CACHE_DIR,
+                size_limit=settings.ANALYSIS_DISK_CACHE_SIZE
+            )
+        except Exception as e:
+            logger.warning("打开分析结果磁盘缓存失败: %s", e)
+            return None
+    return _disk_cache
+
+
+def _disk_cache_key(key: str, versions: Tuple[str, ...]) -> str:
+    """磁盘缓存键包含模型版本，模型升级后旧条目自然失效"""
+    return f"{key}:{':'.join(versions)}"
+
+
+def _remember_analysis(key: str, result: Dict[str, Any]):
+    """写入内存缓存，超出容量时淘汰最久未使用的条目"""
+    _analysis_cache[key] = result
+    _analysis_cache.move_to_end(key)
+    if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+        _analysis_cache.popitem(last=False)
+
+
+def _get_cached_analysis(key: str) -> Optional[Dict[str, Any]]:
+    """读取缓存（先内存后磁盘）；模型版本变化时清空内存缓存
+    
+    返回缓存结果的深拷贝，调用方修改返回值不会影响缓存。
+    """
+    global _analysis_cache_versions
+    
+    versions = _current_model_versions()
+    if versions != _analysis_cache_versions:
+        _analysis_cache.clear()
+        _analysis_cache_versions = versions
+    
+    result = _analysis_cache.get(key)
+    if result is not None:
+        _analysis_cache.move_to_end(key)
+        return copy.deepcopy(result)
+    
+    # 内存未命中时查磁盘缓存，命中后回填内存
+    disk = _get_disk_cache()
+    if disk is not None:
+        try:
+            result = disk.get(_disk_cache_key(key, versions))
+        except Exception as e:
+            logger.warning("读取分析结果磁盘缓存失败: %s", e)
+            return None
+        if result is not None:
+            _remember_analysis(key, result)
+            return copy.deepcopy(result)
+    return result
+
+
+def _store_cached_analysis(key: str, result: Dict[str, Any]):
+    """写入内存缓存和磁盘缓存（内存中保存副本，result仍归调用方所有）"""
+    _remember_analysis(key, copy.deepcopy(result))
+    
+    disk = _get_disk_cache()
+    if disk is not None:
+        try:
+            disk.set(_disk_cache_key(key, _current_model_versions()), result)
+        except Exception as e:
+            logger.warning("写入分析结果磁盘缓存失败: %s", e)
+
+
+def _stage_cache_key(project_data: Dict[str, Any], version: str) -> str:
+    """按FEATURE_INPUT_KEYS字段与模型版本计算的稳定哈希"""
+    payload = orjson.dumps(
+        {key: project_data.get(key) for key in FEATURE_INPUT_KEYS},
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+    return hashlib.blake2b(payload + version.encode(), digest_size=16).hexdigest()
+
+
+async def _cached_stage(
+    cache: "OrderedDict[str, Dict[str, Any]]",
+    projects: List[Dict[str, Any]],
+    version: str,
+    compute_batch
+) -> List[Dict[str, Any]]:
+    """带LRU缓存地执行一个分析阶段，只对未命中的项目调用compute_batch
+    
+    缓存中保存的是副本，命中时也返回副本，调用方可以自由修改结果。
+    """
+    keys = [_stage_cache_key(project_data, version) for project_data in projects]
+    results = [cache.get(key) for key in keys]
+    
+    missing = []
+    for i, (key, result) in enumerate(zip(keys, results)):
+        if result is None:
+            missing.append(i)
+        else:
+            cache.move_to_end(key)
+            results[i] = copy.deepcopy(result)
+    
+    if missing:
+        computed = await compute_batch([projects[i] for i in missing])
+        for i, result in zip(missing, computed):
+            results[i] = result
+            # 失败的结果不缓存
+            if "error" in result or "feature_extraction_error" in result:
+                continue
+            cache[keys[i]] = copy.deepcopy(result)
+            if len(cache) > STAGE_CACHE_SIZE:
+                cache.popitem(last=False)
+    
+    return results
+
+
+async def _extract_features_cached(projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """批量提取特征（带缓存）"""
+    return await _cached_stage(
+        _feature_cache, projects, _feature_extractor.version, _feature_extractor.extract_features_batch
+    )
+
+
+async def _analyze_tech_stack_cached(projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """批量分析技术栈（带缓存）"""
+    return await _cached_stage(
+        _tech_cache, projects, _tech_stack_analyzer.version, _tech_stack_analyzer.analyze_tech_stack_batch
+    )
+
 
 async def load_models():
-    """加载所有机器学习模型"""
-    global _project_classifier, _tech_stack_analyzer, _feature_extractor, _nlp_processor
+    """加载所有机器学习模型（幂等，并发调用时只加载一次）"""
+    global _load_lock
+    
+    if _loaded:
+        return
+    
+    # 锁在首次调用时创建，绑定到实际运行的事件循环
+    if _load_lock is None:
+        _load_lock = asyncio.Lock()
+    
+    async with _load_lock:
+        # 等待锁期间可能已由其他调用方加载完成
+        if _loaded:
+            return
+        await _load_models_locked()
+
+
+async def _warmup_models():
+    """用一个示例项目完整执行一次分析流程（编译评分内核、初始化各模型的首次调用路径）"""
+    try:
+        await _analyze_batch([_WARMUP_PROJECT])
+        logger.info("模型预热完成")
+    except Exception as e:
+        logger.warning("模型预热失败: %s", e)
+
+
+async def _ensure_loaded():
+    """确保模型已加载"""
+    if not _loaded:
+        await load_models()
+
+
+async def _load_models_locked():
+    """实际加载模型，调用方须持有_load_lock"""
+    global _project_classifier, _tech_stack_analyzer, _feature_extractor, _nlp_processor, _loaded
     
     try:
         logger.info("开始加载机器学习模型...")
         
+        from .project_classifier import ProjectClassifier
+        from .tech_stack_analyzer import TechStackAnalyzer
+        from .feature_extractor import FeatureExtractor
+        from .nlp_processor import NLPProcessor
+        
         # 加载NLP处理器
         _nlp_processor = NLPProcessor()
         await _nlp_processor.load_model()
@@ -49,13 +303,264 @@ async def load_models():
         await _tech_stack_analyzer.load_model()
         logger.info("技术栈分析器加载完成")
         
+        # 预热：首个真实请求不再承担首次调用的初始化开销
+        if settings.MODEL_WARMUP:
+            await _warmup_models()
+        
+        _loaded = True
         logger.info("所有机器学习模型加载完成")
         
     except Exception as e:
-        logger.error(f"加载模型失败: {e}")
+        logger.error("加载模型失败: %s", e)
         raise
 
 
+class _Batcher:
+    """
+    微批处理器
+    
+    在一个短时间窗口内收集并发的单项目分析请求，合并为一批后
+    由各模型一次性处理；队列中已攒满一批或没有批次在执行时不再等待窗口。
+    各批次作为独立任务并发执行。
+    """
+    
+    def __init__(self, handler, window_ms: float = BATCH_WINDOW_MS, max_batch: int = MAX_BATCH):
+        self._handler = handler
+        self._window = window_ms / 1000
+        self._max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._dispatches: Set[asyncio.Task] = set()  # 执行中的批次任务引用
+    
+    def _ensure_started(self):
+        """在当前事件循环中启动后台批处理任务"""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+    
+    async def submit(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """提交单个项目，等待所在批次完成后返回结果"""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+    
+    async def _run(self):
+        """后台任务：按时间窗口或批大小聚合请求，每批交给独立任务执行"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            
+            # 已有批次在执行且队列中未攒满一批时，等待一个窗口期让并发请求进入同一批；
+            # 空闲时只让出一次事件循环，收下同一轮提交的请求，单个请求不必等满窗口
+            if self._dispatches and self._queue.qsize() < self._max_batch - 1:
+                await asyncio.sleep(self._window)
+            else:
+                await asyncio.sleep(0)
+            
+            while len(batch) < self._max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            task = loop.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+    
+    async def _dispatch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """执行一个批次并将结果分发给各个等待者"""
+        try:
+            results = await self._handler([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def _needs_nlp(description: Any) -> bool:
+    """描述是否值得做NLP分析：过短或以符号、数字为主的描述（如"n/a"、"---"）直接跳过"""
+    if not isinstance(description, str):
+        return False
+    
+    text = description.strip()
+    if len(text) < MIN_NLP_TEXT_LENGTH:
+        return False
+    
+    # 只抽查开头部分的字符构成
+    sample = text[:200]
+    letters = sum(1 for ch in sample if ch.isalpha())
+    return letters >= len(sample) * MIN_NLP_LETTER_RATIO
+
+
+async def _analyze_batch(projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    批量分析项目（模型须已加载）
+    
+    Args:
+        projects: 项目数据列表
+        
+    Returns:
+        与输入顺序一致的分析结果列表
+    """
+    try:
+        # 只有描述有实际内容的项目需要NLP分析
+        text_indices = [i for i, project_data in enumerate(projects) if _needs_nlp(project_data.get("description"))]
+        
+        # 特征提取、项目分类、技术栈分析和NLP分析互不依赖，各自对整批执行并发运行
+        results = await asyncio.gather(
+            _extract_features_cached(projects),
+            _project_classifier.predict_batch(projects),
+            _analyze_tech_stack_cached(projects),
+            _nlp_processor.analyze_text_batch([projects[i]["description"] for i in text_indices]),
+            return_exceptions=True
+        )
+        
+        # 任一阶段失败时与原先一样走整体降级结果
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        
+        features_list, category_list, tech_list, nlp_results = results
+        
+        nlp_list = [{} for _ in projects]
+        for i, nlp_analysis in zip(text_indices, nlp_results):
+            nlp_list[i] = nlp_analysis
+        
+        # 评分、风险评估与建议生成（配置了进程池时在子进程中执行）
+        scored_list = await _run_scoring(features_list, tech_list, category_list)
+        
+        return [
+            _build_analysis_result(features, category_result, tech_analysis, nlp_analysis, scored)
+            for features, category_result, tech_analysis, nlp_analysis, scored
+            in zip(features_list, category_list, tech_list, nlp_list, scored_list)
+        ]
+        
+    except Exception as e:
+        logger.error("项目分析失败: %s", e)
+        fallback = _fallback_analysis(e)
+        return [dict(fallback) for _ in projects]
+
+
+def _get_scoring_pool() -> Optional[ProcessPoolExecutor]:
+    """按需创建评分进程池；SCORING_WORKERS为0时不使用进程池"""
+    global _scoring_pool
+    
+    if _scoring_pool is None and settings.SCORING_WORKERS > 0:
+        _scoring_pool = ProcessPoolExecutor(max_workers=settings.SCORING_WORKERS)
+    return _scoring_pool
+
+
+async def _run_scoring(
+    features_list: List[Dict[str, Any]],
+    tech_list: List[Dict[str, Any]],
+    category_list: List[Dict[str, Any]]
+) -> List[Tuple[float, float, Dict[str, Any], List[str]]]:
+    """执行批量评分，配置了进程池时放到子进程中，避免占用事件循环"""
+    pool = _get_scoring_pool()
+    if pool is None:
+        return _score_batch(features_list, tech_list, category_list)
+    
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, _score_batch, features_list, tech_list, category_list)
+
+
+def _score_batch(
+    features_list: List[Dict[str, Any]],
+    tech_list: List[Dict[str, Any]],
+    category_list: List[Dict[str, Any]]
+) -> List[Tuple[float, float, Dict[str, Any], List[str]]]:
+    """
+    批量计算评分、风险评估与建议（纯函数，可在子进程中执行）
+    
+    Returns:
+        每个项目的(复杂度评分, 成熟度评分, 风险评估, 建议)
+    """
+    results = []
+    
+    # 整批特征转为矩阵后一次计算所有项目的评分
+    scores_list = calculate_scores_batch(features_list, tech_list)
+    
+    for features, tech_analysis, category_result, scores in zip(features_list, tech_list, category_list, scores_list):
+        # 无法批量计算的项目逐项计算
+        if scores is None:
+            complexity_score = calculate_complexity_score(features, tech_analysis)
+            maturity_score = calculate_maturity_score(features, tech_analysis)
+            risk_flags = None
+        else:
+            complexity_score, maturity_score = scores[:2]
+            risk_flags = scores[2:]
+        
+        # 过时技术列表由风险评估和建议生成共用
+        outdated_tech = tech_analysis.get("outdated_technologies") or []
+        
+        results.append((
+            complexity_score,
+            maturity_score,
+            assess_risks(features, tech_analysis, risk_flags, outdated_tech),
+            generate_recommendations(features, tech_analysis, category_result, outdated_tech)
+        ))
+    
+    return results
+
+
+def _build_analysis_result(
+    features: Dict[str, Any],
+    category_result: Dict[str, Any],
+    tech_analysis: Dict[str, Any],
+    nlp_analysis: Dict[str, Any],
+    scored: Tuple[float, float, Dict[str, Any], List[str]]
+) -> Dict[str, Any]:
+    """组合各模型输出与评分结果为分析结果"""
+    complexity_score, maturity_score, risk_assessment, recommendations = scored
+    
+    return {
+        "category": category_result,
+        "tech_stack_analysis": tech_analysis,
+        "features": features,
+        "nlp_analysis": nlp_analysis,
+        "complexity_score": complexity_score,
+        "maturity_score": maturity_score,
+        "risk_assessment": risk_assessment,
+        "recommendations": recommendations,
+        "model_versions": {
+            "classifier": _project_classifier.version if _project_classifier else "unknown",
+            "tech_analyzer": _tech_stack_analyzer.version if _tech_stack_analyzer else "unknown",
+            "feature_extractor": _feature_extractor.version if _feature_extractor else "unknown",
+            "nlp_processor": _nlp_processor.version if _nlp_processor else "unknown"
+        }
+    }
+
+
+# 分析失败时返回的基础分析结果模板（只读，返回时浅拷贝并附加错误信息）
+_FALLBACK_RESULT = MappingProxyType({
+    "category": {"name": "unknown", "confidence": 0.0},
+    "tech_stack_analysis": {"detected_tech": [], "confidence": 0.0},
+    "features": {},
+    "nlp_analysis": {},
+    "complexity_score": 50.0,
+    "maturity_score": 50.0,
+    "risk_assessment": {"level": "medium", "factors": []},
+    "recommendations": ["分析过程中出现错误"],
+    "model_versions": {"classifier": "error", "tech_analyzer": "error"}
+})
+
+# 技术栈分析失败时的结果模板
+_TECH_FALLBACK_RESULT = MappingProxyType({"detected_tech": [], "confidence": 0.0})
+
+
+def _fallback_analysis(error: Exception) -> Dict[str, Any]:
+    """分析失败时返回的基础分析结果"""
+    return {**_FALLBACK_RESULT, "error": str(error)}
+
+
+# 单项目分析请求经微批处理器合并后执行
+_batcher = _Batcher(_analyze_batch)
+
+
 async def analyze_project(project_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     分析项目
@@ -68,58 +573,116 @@ async def analyze_project(project_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     try:
         # 确保模型已加载
-        if not all([_project_classifier, _tech_stack_analyzer, _feature_extractor, _nlp_processor]):
-            await load_models()
-        
-        # 提取项目特征
-        features = await _feature_extractor.extract_features(project_data)
-        
-        # 项目分类
-        category_result = await _project_classifier.predict(project_data)
-        
-        # 技术栈分析
-        tech_analysis = await _tech_stack_analyzer.analyze_tech_stack(project_data)
-        
-        # NLP分析（如果有描述）
-        nlp_analysis = {}
-        if project_data.get("description"):
-            nlp_analysis = await _nlp_processor.analyze_text(project_data["description"])
-        
-        # 组合分析结果
-        analysis_result = {
-            "category": category_result,
-            "tech_stack_analysis": tech_analysis,
-            "features": features,
-            "nlp_analysis": nlp_analysis,
-            "complexity_score": calculate_complexity_score(features, tech_analysis),
-            "maturity_score": calculate_maturity_score(features, tech_analysis),
-            "risk_assessment": assess_risks(features, tech_analysis),
-            "recommendations": generate_recommendations(features, tech_analysis, category_result),
-            "model_versions": {
-                "classifier": _project_classifier.version if _project_classifier else "unknown",
-                "tech_analyzer": _tech_stack_analyzer.version if _tech_stack_analyzer else "unknown",
-                "feature_extractor": _feature_extractor.version if _feature_extractor else "unknown",
-                "nlp_processor": _nlp_processor.version if _nlp_processor else "unknown"
-            }
-        }
+        await _ensure_loaded()
+        
+        # 相同的项目数据直接返回缓存结果
+        cache_key = _analysis_cache_key(project_data)
+        cached = _get_cached_analysis(cache_key)
+        if cached is not None:
+            return cached
+        
+        # 与同一时间窗口内的其他请求合并为一批执行
+        analysis_result = await _batcher.submit(project_data)
         
+        if "error" not in analysis_result:
+            _store_cached_analysis(cache_key, analysis_result)
         return analysis_result
         
     except Exception as e:
-        logger.error(f"项目分析失败: {e}")
+        logger.error("项目分析失败: %s", e)
         # 返回基础分析结果
-        return {
-            "category": {"name": "unknown", "confidence": 0.0},
-            "tech_stack_analysis": {"detected_tech": [], "confidence": 0.0},
-            "features": {},
-            "nlp_analysis": {},
-            "complexity_score": 50.0,
-            "maturity_score": 50.0,
-            "risk_assessment": {"level": "medium", "factors": []},
-            "recommendations": ["分析过程中出现错误"],
-            "model_versions": {"classifier": "error", "tech_analyzer": "error"},
-            "error": str(e)
+        return _fallback_analysis(e)
+
+
+async def analyze_projects_batch(projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    批量分析项目
+    
+    Args:
+        projects: 项目数据列表
+        
+    Returns:
+        与输入顺序一致的分析结果列表
+    """
+    try:
+        # 确保模型已加载
+        await _ensure_loaded()
+    except Exception as e:
+        logger.error("项目分析失败: %s", e)
+        fallback = _fallback_analysis(e)
+        return [dict(fallback) for _ in projects]
+    
+    # 先查缓存，未命中的项目合并为一批执行
+    cache_keys = [_analysis_cache_key(project_data) for project_data in projects]
+    results = [_get_cached_analysis(cache_key) for cache_key in cache_keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    
+    if missing:
+        batch_results = await _analyze_batch([projects[i] for i in missing])
+        for i, analysis_result in zip(missing, batch_results):
+            results[i] = analysis_result
+            if "error" not in analysis_result:
+                _store_cached_analysis(cache_keys[i], analysis_result)
+    
+    return results
+
+
+async def analyze_project_stream(project_data: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    流式分析项目，每个阶段完成即产出结果
+    
+    Args:
+        project_data: 项目数据
+        
+    Yields:
+        (字段名, 结果)：先按完成顺序产出features、category、tech_stack_analysis、nlp_analysis，
+        再产出评分、风险评估、建议和模型版本，字段名与analyze_project的结果一致
+    """
+    await _ensure_loaded()
+    
+    async def run_stage(name: str, stage, *args) -> Tuple[str, Any]:
+        return name, await stage(*args)
+    
+    async def empty_stage() -> Dict[str, Any]:
+        return {}
+    
+    description = project_data.get("description")
+    tasks = [
+        asyncio.ensure_future(run_stage("features", extract_features, project_data)),
+        asyncio.ensure_future(run_stage("category", classify_project, project_data)),
+        asyncio.ensure_future(run_stage("tech_stack_analysis", analyze_tech_stack, project_data)),
+        asyncio.ensure_future(
+            run_stage("nlp_analysis", _nlp_processor.analyze_text, description)
+            if _needs_nlp(description) else run_stage("nlp_analysis", empty_stage)
+        )
+    ]
+    
+    try:
+        stages = {}
+        for future in asyncio.as_completed(tasks):
+            name, result = await future
+            stages[name] = result
+            yield name, result
+        
+        # 评分依赖特征、技术栈与分类结果，在各阶段完成后计算
+        complexity_score, maturity_score, risk_assessment, recommendations = _score_batch(
+            [stages["features"]], [stages["tech_stack_analysis"]], [stages["category"] or {}]
+        )[0]
+        yield "complexity_score", complexity_score
+        yield "maturity_score", maturity_score
+        yield "risk_assessment", risk_assessment
+        yield "recommendations", recommendations
+        yield "model_versions", {
+            "classifier": _project_classifier.version,
+            "tech_analyzer": _tech_stack_analyzer.version,
+            "feature_extractor": _feature_extractor.version,
+            "nlp_processor": _nlp_processor.version
         }
+        
+    finally:
+        # 调用方提前停止迭代时取消未完成的阶段
+        for task in tasks:
+            task.cancel()
 
 
 async def classify_project(project_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -133,13 +696,12 @@ async def classify_project(project_data: Dict[str, Any]) -> Optional[Dict[str, A
         分类结果
     """
     try:
-        if not _project_classifier:
-            await load_models()
+        await _ensure_loaded()
         
         return await _project_classifier.predict(project_data)
         
     except Exception as e:
-        logger.error(f"项目分类失败: {e}")
+        logger.error("项目分类失败: %s", e)
         return None
 
 
@@ -154,14 +716,13 @@ async def analyze_tech_stack(project_data: Dict[str, Any]) -> Dict[str, Any]:
         技术栈分析结果
     """
     try:
-        if not _tech_stack_analyzer:
-            await load_models()
+        await _ensure_loaded()
         
-        return await _tech_stack_analyzer.analyze_tech_stack(project_data)
+        return (await _analyze_tech_stack_cached([project_data]))[0]
         
     except Exception as e:
-        logger.error(f"技术栈分析失败: {e}")
-        return {"detected_tech": [], "confidence": 0.0, "error": str(e)}
+        logger.error("技术栈分析失败: %s", e)
+        return {**_TECH_FALLBACK_RESULT, "error": str(e)}
 
 
 async def extract_features(project_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -175,81 +736,245 @@ async def extract_features(project_data: Dict[str, Any]) -> Dict[str, Any]:
         特征字典
     """
     try:
-        if not _feature_extractor:
-            await load_models()
+        await _ensure_loaded()
         
-        return await _feature_extractor.extract_features(project_data)
+        return (await _extract_features_cached([project_data]))[0]
         
     except Exception as e:
-        logger.error(f"特征提取失败: {e}")
+        logger.error("特征提取失败: %s", e)
         return {}
 
 
+# numba为可选依赖，不可用时评分内核以纯Python执行
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """numba不可用时的空装饰器"""
+        def decorator(func):
+            return func
+        return decorator
+
+
+# 评分保留的小数位数（批量评分以float32计算，更高精度没有意义）
+SCORE_DECIMALS = 4
+
+# 评分内核使用的特征及其在特征向量中的位置
+FEATURE_KEYS = (
+    "project_size",
+    "architecture_complexity",
+    "documentation_score",
+    "test_coverage",
+    "security_issues",
+    "maintenance_score"
+)
+(
+    _PROJECT_SIZE,
+    _ARCH_COMPLEXITY,
+    _DOC_SCORE,
+    _TEST_COVERAGE,
+    _SECURITY_ISSUES,
+    _MAINTENANCE_SCORE
+) = range(len(FEATURE_KEYS))
+
+
+def _pack(features: Dict[str, Any]) -> np.ndarray:
+    """按FEATURE_KEYS将特征打包为定长向量，缺失的特征用NaN表示"""
+    vec = np.full(len(FEATURE_KEYS), np.nan)
+    for i, key in enumerate(FEATURE_KEYS):
+        if key in features:
+            vec[i] = features[key]
+    return vec
+
+
+@njit(cache=True, nogil=True)
+def _score_kernel(vec, tech_count, tech_maturity):
+    """评分内核，返回(复杂度评分, 成熟度评分, 是否存在安全漏洞, 是否维护困难)"""
+    # 复杂度：基础分 + 技术栈多样性（每项技术+5分，最多+25分）
+    complexity = 50.0 + min(tech_count * 5.0, 25.0)
+    
+    # 基于项目规模
+    size = vec[_PROJECT_SIZE]
+    if not np.isnan(size):
+        if size > 1000:
+            complexity += 15
+        elif size > 500:
+            complexity += 10
+        elif size > 100:
+            complexity += 5
+    
+    # 基于架构复杂度
+    if not np.isnan(vec[_ARCH_COMPLEXITY]):
+        complexity += vec[_ARCH_COMPLEXITY] * 10
+    
+    # 成熟度：基础分 + 技术栈成熟度
+    maturity = 50.0 + (tech_maturity - 0.5) * 40
+    
+    # 基于文档完整性
+    if not np.isnan(vec[_DOC_SCORE]):
+        maturity += (vec[_DOC_SCORE] - 0.5) * 20
+    
+    # 基于测试覆盖率
+    if not np.isnan(vec[_TEST_COVERAGE]):
+        maturity += (vec[_TEST_COVERAGE] - 0.5) * 20
+    
+    # 风险阈值（与NaN比较恒为False，缺失特征不计入风险）
+    has_security_issues = vec[_SECURITY_ISSUES] > 0
+    hard_to_maintain = vec[_MAINTENANCE_SCORE] < 0.3
+    
+    return (
+        min(max(complexity, 0.0), 100.0),
+        min(max(maturity, 0.0), 100.0),
+        has_security_issues,
+        hard_to_maintain
+    )
+
+
+def _score_features(features: Dict[str, Any], tech_analysis: Dict[str, Any]) -> Tuple[float, float, bool, bool]:
+    """打包特征并执行评分内核"""
+    complexity, maturity, has_security_issues, hard_to_maintain = _score_kernel(
+        _pack(features),
+        len(tech_analysis.get("detected_tech", [])),
+        float(tech_analysis.get("tech_maturity", 0.5))
+    )
+    return (
+        round(float(complexity), SCORE_DECIMALS),
+        round(float(maturity), SCORE_DECIMALS),
+        bool(has_security_issues),
+        bool(hard_to_maintain)
+    )
+
+
 def calculate_complexity_score(features: Dict[str, Any], tech_analysis: Dict[str, Any]) -> float:
     """计算复杂度评分"""
     try:
-        score = 50.0  # 基础分
-        
-        # 基于技术栈多样性
-        tech_count = len(tech_analysis.get("detected_tech", []))
-        score += min(tech_count * 5, 25)  # 每项技术+5分，最多+25分
-        
-        # 基于项目规模（如果有）
-        if "project_size" in features:
-            size = features["project_size"]
-            if size > 1000:
-                score += 15
-            elif size > 500:
-                score += 10
-            elif size > 100:
-                score += 5
-        
-        # 基于架构复杂度
-        if "architecture_complexity" in features:
-            complexity = features["architecture_complexity"]
-            score += complexity * 10
-        
-        return min(max(score, 0), 100)
+        return _score_features(features, tech_analysis)[0]
         
     except Exception as e:
-        logger.error(f"计算复杂度评分失败: {e}")
+        logger.error("计算复杂度评分失败: %s", e)
         return 50.0
 
 
 def calculate_maturity_score(features: Dict[str, Any], tech_analysis: Dict[str, Any]) -> float:
     """计算成熟度评分"""
     try:
-        score = 50.0  # 基础分
-        
-        # 基于技术栈成熟度
-        tech_maturity = tech_analysis.get("tech_maturity", 0.5)
-        score += (tech_maturity - 0.5) * 40  # 调整范围
-        
-        # 基于文档完整性
-        if "documentation_score" in features:
-            doc_score = features["documentation_score"]
-            score += (doc_score - 0.5) * 20
-        
-        # 基于测试覆盖率
-        if "test_coverage" in features:
-            test_score = features["test_coverage"]
-            score += (test_score - 0.5) * 20
-        
-        return min(max(score, 0), 100)
+        return _score_features(features, tech_analysis)[1]
         
     except Exception as e:
-        logger.error(f"计算成熟度评分失败: {e}")
+        logger.error("计算成熟度评分失败: %s", e)
         return 50.0
 
 
-def assess_risks(features: Dict[str, Any], tech_analysis: Dict[str, Any]) -> Dict[str, Any]:
-    """风险评估"""
+def _features_to_matrix(
+    features_list: List[Dict[str, Any]],
+    tech_list: List[Dict[str, Any]]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    将一批特征转为按列连续存储（Fortran序）的float32矩阵
+    
+    Returns:
+        (特征矩阵[N, len(FEATURE_KEYS)]（缺失为NaN）, 技术数量[N]（int16）, 技术栈成熟度[N], 有效行掩码[N])
+    """
+    n = len(features_list)
+    matrix = np.full((n, len(FEATURE_KEYS)), np.nan, dtype=np.float32, order="F")
+    tech_counts = np.zeros(n, dtype=np.int16)
+    tech_maturities = np.full(n, 0.5, dtype=np.float32)
+    valid = np.ones(n, dtype=bool)
+    
+    for row, (features, tech_analysis) in enumerate(zip(features_list, tech_list)):
+        try:
+            matrix[row] = [features.get(key, np.nan) for key in FEATURE_KEYS]
+            # 技术数量超过5项后不再影响评分，截断后可安全存为int16
+            tech_counts[row] = min(len(tech_analysis.get("detected_tech", [])), 5)
+            tech_maturities[row] = tech_analysis.get("tech_maturity", 0.5)
+        except (TypeError, ValueError):
+            # 无法转为数值的行交由逐项评分处理
+            valid[row] = False
+    
+    return matrix, tech_counts, tech_maturities, valid
+
+
+def complexity_batch(matrix: np.ndarray, tech_counts: np.ndarray) -> np.ndarray:
+    """批量计算复杂度评分：基础分 + 技术栈多样性 + 项目规模 + 架构复杂度（原地运算保持float32）"""
+    size = matrix[:, _PROJECT_SIZE]
+    arch = matrix[:, _ARCH_COMPLEXITY]
+    
+    score = np.full(matrix.shape[0], 50.0, dtype=np.float32)
+    score += tech_counts * np.float32(5.0)
+    score += np.where(size > 1000, 15, np.where(size > 500, 10, np.where(size > 100, 5, 0)))
+    score += np.where(np.isnan(arch), np.float32(0.0), arch * np.float32(10.0))
+    return np.clip(score, 0.0, 100.0, out=score)
+
+
+def maturity_batch(matrix: np.ndarray, tech_maturities: np.ndarray) -> np.ndarray:
+    """批量计算成熟度评分：基础分 + 技术栈成熟度 + 文档完整性 + 测试覆盖率"""
+    doc = matrix[:, _DOC_SCORE]
+    test = matrix[:, _TEST_COVERAGE]
+    
+    score = np.full(matrix.shape[0], 50.0, dtype=np.float32)
+    score += (tech_maturities - np.float32(0.5)) * np.float32(40.0)
+    score += np.where(np.isnan(doc), np.float32(0.0), (doc - np.float32(0.5)) * np.float32(20.0))
+    score += np.where(np.isnan(test), np.float32(0.0), (test - np.float32(0.5)) * np.float32(20.0))
+    return np.clip(score, 0.0, 100.0, out=score)
+
+
+def calculate_scores_batch(
+    features_list: List[Dict[str, Any]],
+    tech_list: List[Dict[str, Any]]
+) -> List[Optional[Tuple[float, float, bool, bool]]]:
+    """
+    批量计算评分，按列以float32向量化计算复杂度、成熟度与风险阈值
+    
+    Returns:
+        每个项目的(复杂度评分, 成熟度评分, 是否存在安全漏洞, 是否维护困难)，无法批量计算的项目为None
+    """
+    matrix, tech_counts, tech_maturities, valid = _features_to_matrix(features_list, tech_list)
+    
+    complexity = complexity_batch(matrix, tech_counts)
+    maturity = maturity_batch(matrix, tech_maturities)
+    
+    # 风险阈值（与NaN比较恒为False）
+    has_security_issues = matrix[:, _SECURITY_ISSUES] > 0
+    hard_to_maintain = matrix[:, _MAINTENANCE_SCORE] < np.float32(0.3)
+    
+    # 一次性转回Python对象，舍去float32的尾部误差
+    complexity = np.round(complexity.astype(np.float64), SCORE_DECIMALS).tolist()
+    maturity = np.round(maturity.astype(np.float64), SCORE_DECIMALS).tolist()
+    has_security_issues = has_security_issues.tolist()
+    hard_to_maintain = hard_to_maintain.tolist()
+    
+    return [
+        (complexity[i], maturity[i], has_security_issues[i], hard_to_maintain[i]) if valid[i] else None
+        for i in range(len(features_list))
+    ]
+
+
+def assess_risks(
+    features: Dict[str, Any],
+    tech_analysis: Dict[str, Any],
+    risk_flags: Optional[Tuple[bool, bool]] = None,
+    outdated_tech: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    风险评估
+    
+    risk_flags为已算出的(是否存在安全漏洞, 是否维护困难)，outdated_tech为已取出的过时技术列表，
+    缺失时在此计算
+    """
     try:
         risks = []
         risk_level = "low"
         
+        if risk_flags is None:
+            risk_flags = _score_features(features, tech_analysis)[2:]
+        has_security_issues, hard_to_maintain = risk_flags
+        
         # 技术栈风险
-        outdated_tech = tech_analysis.get("outdated_technologies", [])
+        if outdated_tech is None:
+            outdated_tech = tech_analysis.get("outdated_technologies", [])
         if outdated_tech:
             risks.append(f"使用了过时技术: {', '.join(outdated_tech)}")
             risk_level = "medium"
@@ -261,18 +986,14 @@ def assess_risks(features: Dict[str, Any], tech_analysis: Dict[str, Any]) -> Dic
             risk_level = "medium"
         
         # 安全风险
-        if "security_issues" in features:
-            security_issues = features["security_issues"]
-            if security_issues > 0:
-                risks.append(f"存在安全漏洞: {security_issues}个")
-                risk_level = "high"
+        if has_security_issues:
+            risks.append(f"存在安全漏洞: {features['security_issues']}个")
+            risk_level = "high"
         
         # 维护风险
-        if "maintenance_score" in features:
-            maintenance = features["maintenance_score"]
-            if maintenance < 0.3:
-                risks.append("维护困难")
-                risk_level = "medium"
+        if hard_to_maintain:
+            risks.append("维护困难")
+            risk_level = "medium"
         
         return {
             "level": risk_level,
@@ -282,57 +1003,75 @@ def assess_risks(features: Dict[str, Any], tech_analysis: Dict[str, Any]) -> Dic
         }
         
     except Exception as e:
-        logger.error(f"风险评估失败: {e}")
+        logger.error("风险评估失败: %s", e)
         return {"level": "unknown", "factors": ["评估失败"], "error": str(e)}
 
 
+# 基于分类的建议（按类别预先确定，无对应条目的类别没有分类建议）
+_CATEGORY_RECOMMENDATIONS: Dict[str, Tuple[str, ...]] = {
+    "web_development": (
+        "考虑使用现代前端框架如React或Vue.js",
+        "实施响应式设计以支持移动设备"
+    ),
+    "machine_learning": (
+        "考虑使用PyTorch或TensorFlow进行模型开发",
+        "添加模型评估和监控机制"
+    )
+}
+
+# 特征建议规则的触发条件位
+_REC_LOW_DOCS = 1 << 0
+_REC_LOW_TESTS = 1 << 1
+_REC_SEC_ISSUES = 1 << 2
+
+# 基于特征的通用建议规则：(条件位, 建议)
+_FEATURE_RULES: Tuple[Tuple[int, str], ...] = (
+    (_REC_LOW_DOCS, "加强文档编写，特别是API文档和部署指南"),
+    (_REC_LOW_TESTS, "增加测试覆盖率，特别是单元测试和集成测试"),
+    (_REC_SEC_ISSUES, "立即修复发现的安全漏洞")
+)
+
+# 建议不足3条时补充的通用建议
+_GENERIC_RECOMMENDATIONS = (
+    "实施持续集成/持续部署(CI/CD)流程",
+    "添加性能监控和日志记录",
+    "定期进行代码审查和重构",
+    "考虑容器化部署以提高可移植性"
+)
+
+
 def generate_recommendations(
     features: Dict[str, Any], 
     tech_analysis: Dict[str, Any], 
-    category_result: Dict[str, Any]
+    category_result: Dict[str, Any],
+    outdated_tech: Optional[List[str]] = None
 ) -> List[str]:
-    """生成建议"""
+    """生成建议（outdated_tech为已取出的过时技术列表，缺失时从tech_analysis读取）"""
     try:
-        recommendations = []
-        
-        # 基于分类的建议
-        category = category_result.get("name", "")
-        if category == "web_development":
-            recommendations.append("考虑使用现代前端框架如React或Vue.js")
-            recommendations.append("实施响应式设计以支持移动设备")
-        elif category == "machine_learning":
-            recommendations.append("考虑使用PyTorch或TensorFlow进行模型开发")
-            recommendations.append("添加模型评估和监控机制")
-        
-        # 基于技术栈的建议
-        outdated_tech = tech_analysis.get("outdated_technologies", [])
-        for tech in outdated_tech:
-            recommendations.append(f"考虑升级或替换过时技术: {tech}")
-        
-        # 基于特征的通用建议
+        # 计算特征建议的触发条件
+        flags = 0
         if "documentation_score" in features and features["documentation_score"] < 0.5:
-            recommendations.append("加强文档编写，特别是API文档和部署指南")
-        
+            flags |= _REC_LOW_DOCS
         if "test_coverage" in features and features["test_coverage"] < 0.3:
-            recommendations.append("增加测试覆盖率，特别是单元测试和集成测试")
-        
+            flags |= _REC_LOW_TESTS
         if "security_issues" in features and features["security_issues"] > 0:
-            recommendations.append("立即修复发现的安全漏洞")
+            flags |= _REC_SEC_ISSUES
+        
+        # 分类建议、过时技术建议、特征建议依次拼接
+        recommendations = list(_CATEGORY_RECOMMENDATIONS.get(category_result.get("name", ""), ()))
+        if outdated_tech is None:
+            outdated_tech = tech_analysis.get("outdated_technologies", [])
+        recommendations.extend(f"考虑升级或替换过时技术: {tech}" for tech in outdated_tech)
+        recommendations.extend(rec for mask, rec in _FEATURE_RULES if (flags & mask) == mask)
         
         # 确保至少有3条建议
         if len(recommendations) < 3:
-            generic_recommendations = [
-                "实施持续集成/持续部署(CI/CD)流程",
-                "添加性能监控和日志记录",
-                "定期进行代码审查和重构",
-                "考虑容器化部署以提高可移植性"
-            ]
-            recommendations.extend(generic_recommendations[:3 - len(recommendations)])
+            recommendations.extend(_GENERIC_RECOMMENDATIONS[:3 - len(recommendations)])
         
         return recommendations[:10]  # 最多返回10条建议
         
     except Exception as e:
-        logger.error(f"生成建议失败: {e}")
+        logger.error("生成建议失败: %s", e)
         return ["系统分析中，请稍后查看详细建议"]
 
 
@@ -340,6 +1079,8 @@ def generate_recommendations(
 __all__ = [
     "load_models",
     "analyze_project",
+    "analyze_projects_batch",
+    "analyze_project_stream",
     "classify_project",
     "analyze_tech_stack",
     "extract_features",
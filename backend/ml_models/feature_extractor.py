@@ -6,10 +6,13 @@
 import logging
 import re
 import math
-from typing import Dict, Any, List, Optional
+from collections import defaultdict
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
 import numpy as np
 from pathlib import Path
 import json
+import joblib
+from scipy.special import xlogy
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
 import nltk
@@ -18,57 +21,129 @@ from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 from config import settings
 
+# pyahocorasick为可选依赖，不可用时逐个关键词做子串查找
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# 句末标点正则，模块加载时编译一次
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+
+# 简单的技术类别映射（实际应用中应该更详细）
+TECH_CATEGORY_MAP = {
+    "language": ["python", "javascript", "java", "c++", "c#", "go", "rust", "ruby", "php", "swift"],
+    "framework": ["django", "flask", "fastapi", "express", "react", "vue", "angular", "spring", "laravel"],
+    "database": ["postgresql", "mysql", "mongodb", "redis", "elasticsearch", "cassandra"],
+    "cloud": ["aws", "azure", "google_cloud", "aliyun", "heroku"],
+    "tool": ["docker", "kubernetes", "git", "jenkins", "terraform"]
+}
+
+# 热门技术（小写）
+POPULAR_TECH = frozenset(("python", "javascript", "react", "docker", "postgresql"))
+
+# 反向索引：技术 -> 类别，模块加载时构建一次（各类别之间没有重复的技术）
+_TECH_TO_CATEGORY: Dict[str, str] = {
+    tech: category
+    for category, techs in TECH_CATEGORY_MAP.items()
+    for tech in techs
+}
+
+# 关键词词典（只读常量，类别 -> 关键词元组）
+QUALITY_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "code": ("clean", "maintainable", "readable", "modular", "tested"),
+    "architecture": ("scalable", "microservices", "modular", "decoupled", "layered"),
+    "documentation": ("documented", "api docs", "readme", "comments", "tutorial"),
+    "testing": ("unit test", "integration test", "coverage", "tdd", "bdd"),
+    "security": ("secure", "encrypted", "authentication", "authorization", "ssl")
+}
+
+INNOVATION_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "novelty": ("innovative", "novel", "unique", "groundbreaking", "original"),
+    "complexity": ("complex", "sophisticated", "advanced", "cutting-edge", "state-of-art"),
+    "automation": ("automated", "ai", "machine learning", "intelligent", "smart")
+}
+
+BUSINESS_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "market": ("market", "business", "commercial", "revenue", "profit"),
+    "user": ("user", "customer", "audience", "demand", "need"),
+    "scale": ("scalable", "growth", "expansion", "large-scale", "enterprise")
+}
+
+KEYWORD_GROUPS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "quality": QUALITY_KEYWORDS,
+    "innovation": INNOVATION_KEYWORDS,
+    "business": BUSINESS_KEYWORDS
+}
+
+# 扁平化的(分组, 类别, 关键词)记录，模块加载时构建一次
+_KEYWORD_RECORDS: Tuple[Tuple[str, str, str], ...] = tuple(
+    (group, category, keyword)
+    for group, keyword_dict in KEYWORD_GROUPS.items()
+    for category, keywords in keyword_dict.items()
+    for keyword in keywords
+)
+
+
+def _build_keyword_automaton():
+    """构建Aho-Corasick自动机：关键词 -> (关键词, 所属的(分组, 类别)元组)"""
+    if ahocorasick is None:
+        return None
+    
+    owners = defaultdict(list)
+    for group, category, keyword in _KEYWORD_RECORDS:
+        owners[keyword].append((group, category))
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, keyword_owners in owners.items():
+        automaton.add_word(keyword, (keyword, tuple(keyword_owners)))
+    automaton.make_automaton()
+    return automaton
+
+
+# 所有关键词编译为一个自动机，一次扫描统计各类别命中数
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+# 1/ln(2)，将自然对数熵换算为以2为底
+_INV_LN2 = 1.4426950408889634
+
 
 class FeatureExtractor:
     """特征提取器"""
     
+    # NLTK数据检查成功后缓存的停用词，进程内只探测一次NLTK数据目录
+    _nltk_stop_words: Optional[FrozenSet[str]] = None
+    
     def __init__(self):
         self.version = "1.0.0"
         self.model_path = Path(settings.MODEL_CACHE_DIR) / "feature_extractor.pkl"
         
         # NLP工具初始化
-        self.stop_words = set()
+        self.stop_words = frozenset()
         self.lemmatizer = None
         
         # 统计模型
         self.vectorizer = None
         self.lda_model = None
-        self.feature_names = []
-        
-        # 关键词词典
-        self.quality_keywords = {
-            "code": ["clean", "maintainable", "readable", "modular", "tested"],
-            "architecture": ["scalable", "microservices", "modular", "decoupled", "layered"],
-            "documentation": ["documented", "api docs", "readme", "comments", "tutorial"],
-            "testing": ["unit test", "integration test", "coverage", "tdd", "bdd"],
-            "security": ["secure", "encrypted", "authentication", "authorization", "ssl"]
-        }
-        
-        self.innovation_keywords = {
-            "novelty": ["innovative", "novel", "unique", "groundbreaking", "original"],
-            "complexity": ["complex", "sophisticated", "advanced", "cutting-edge", "state-of-art"],
-            "automation": ["automated", "ai", "machine learning", "intelligent", "smart"]
-        }
-        
-        self.business_keywords = {
-            "market": ["market", "business", "commercial", "revenue", "profit"],
-            "user": ["user", "customer", "audience", "demand", "need"],
-            "scale": ["scalable", "growth", "expansion", "large-scale", "enterprise"]
-        }
-        
+        # 词表特征名只在训练/加载时整体替换，请求处理期间只读
+        self.feature_names: Tuple[str, ...] = ()
+        # 主题模型是否可用于推断（加载/创建/训练时更新，避免每次调用探测属性）
+        self._topic_ready = False
+    
     async def load_model(self):
         """加载模型"""
         try:
             if self.model_path.exists():
                 logger.info(f"从缓存加载特征提取器: {self.model_path}")
-                import pickle
-                with open(self.model_path, 'rb') as f:
-                    data = pickle.load(f)
-                    self.vectorizer = data.get('vectorizer', None)
-                    self.lda_model = data.get('lda_model', None)
-                    self.feature_names = data.get('feature_names', [])
+                # 以只读内存映射加载：LDA的大数组按需换页，多个worker共享同一份物理内存
+                # （joblib.load同样能读取旧版pickle格式的缓存文件）
+                data = joblib.load(self.model_path, mmap_mode='r')
+                self.vectorizer = data.get('vectorizer', None)
+                self.lda_model = data.get('lda_model', None)
+                self.feature_names = tuple(data.get('feature_names', ()))
+                self._topic_ready = self._topic_model_fitted()
                 
                 logger.info("特征提取器加载完成")
             
@@ -85,6 +160,11 @@ class FeatureExtractor:
     
     def _init_nlp_tools(self):
         """初始化NLP工具"""
+        if FeatureExtractor._nltk_stop_words is not None:
+            self.stop_words = FeatureExtractor._nltk_stop_words
+            self.lemmatizer = WordNetLemmatizer()
+            return
+        
         try:
             # 下载NLTK数据
             try:
@@ -102,12 +182,13 @@ class FeatureExtractor:
             except LookupError:
                 nltk.download('wordnet', quiet=True)
             
-            self.stop_words = set(stopwords.words('english'))
+            self.stop_words = frozenset(stopwords.words('english'))
             self.lemmatizer = WordNetLemmatizer()
+            FeatureExtractor._nltk_stop_words = self.stop_words
             
         except Exception as e:
             logger.warning(f"NLP工具初始化失败: {e}")
-            self.stop_words = set(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'])
+            self.stop_words = frozenset(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'])
             self.lemmatizer = None
     
     def _create_model(self):
@@ -132,6 +213,9 @@ class FeatureExtractor:
                 learning_method='online'
             )
             
+            # 新建的模型尚未拟合，不能用于主题推断
+            self._topic_ready = False
+            
             # 初始化NLP工具
             self._init_nlp_tools()
             
@@ -141,14 +225,44 @@ class FeatureExtractor:
             logger.error(f"创建特征提取模型失败: {e}")
             self.vectorizer = None
             self.lda_model = None
+            self._topic_ready = False
     
     async def extract_features(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
         """提取特征"""
+        return (await self.extract_features_batch([project_data]))[0]
+    
+    async def extract_features_batch(self, projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """批量提取特征：整批文本只做一次向量化和LDA推断，再按行分发给各项目"""
+        texts: List[Optional[str]] = []
+        for project_data in projects:
+            try:
+                texts.append(self._join_text(project_data))
+            except Exception:
+                # 留给单项目提取时重新抛出并生成错误结果
+                texts.append(None)
+        
+        topic_rows = self._infer_topics(texts)
+        
+        return [
+            self._extract_project_features(project_data, full_text, topic_rows.get(i))
+            for i, (project_data, full_text) in enumerate(zip(projects, texts))
+        ]
+    
+    def _extract_project_features(
+        self,
+        project_data: Dict[str, Any],
+        full_text: Optional[str],
+        topic_distribution: Optional[np.ndarray]
+    ) -> Dict[str, Any]:
+        """提取单个项目的特征，主题分布由批量推断传入"""
         try:
             features = {}
             
+            if full_text is None:
+                full_text = self._join_text(project_data)
+            
             # 提取文本特征
-            text_features = self._extract_text_features(project_data)
+            text_features = self._extract_text_features(full_text, topic_distribution)
             features.update(text_features)
             
             # 提取技术特征
@@ -171,26 +285,22 @@ class FeatureExtractor:
             derived_features = self._calculate_derived_features(features)
             features.update(derived_features)
             
-            # 确保所有特征都是可序列化的
-            features = self._make_serializable(features)
+            # 各提取方法已直接产出Python标量（numpy结果在写入处转换），无需再整体转换一遍
             
-            logger.debug(f"提取了 {len(features)} 个特征")
+            logger.debug("提取了 %s 个特征", len(features))
             
             return features
             
         except Exception as e:
-            logger.error(f"特征提取失败: {e}")
+            logger.error("特征提取失败: %s", e)
             return {
                 "feature_extraction_error": str(e),
                 "text_length": 0,
                 "tech_count": 0
             }
     
-    def _extract_text_features(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
-        """提取文本特征"""
-        features = {}
-        
-        # 获取所有文本
+    def _join_text(self, project_data: Dict[str, Any]) -> str:
+        """合并项目名称、描述和元数据中的文本"""
         text_parts = []
         
         if project_data.get("name"):
@@ -206,57 +316,73 @@ class FeatureExtractor:
                     if isinstance(value, str):
                         text_parts.append(value)
         
-        # 合并所有文本
-        full_text = " ".join(text_parts)
+        return " ".join(text_parts)
+    
+    def _infer_topics(self, texts: List[Optional[str]]) -> Dict[int, np.ndarray]:
+        """对足够长的文本批量推断主题分布，返回 行号 -> 主题分布"""
+        # 主题模型需已由train_model训练，且只对有足够文本的项目做主题推断
+        if not self._topic_ready:
+            return {}
+        
+        indices = [i for i, text in enumerate(texts) if text is not None and len(text) > 100]
+        if not indices:
+            return {}
+        
+        try:
+            # 整批向量化并推断（只做transform，不在请求数据上重新拟合模型）
+            X = self.vectorizer.transform([texts[i] for i in indices])
+            topic_distribution = self.lda_model.transform(X)
+        except (ValueError, AttributeError) as e:
+            logger.debug("主题提取失败: %s", e)
+            return {}
+        
+        return {i: topic_distribution[row] for row, i in enumerate(indices)}
+    
+    def _extract_text_features(self, full_text: str, topic_distribution: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """提取文本特征"""
+        features = {}
         
         # 基础文本特征
+        # 只切分一次，小写化按词进行，不再复制整段小写文本
+        words = full_text.split()
+        word_count = len(words)
+        # 句子数 = 句末标点段数 + 1（与按标点切分后的段数相同，但不生成句子字符串），恒大于0
+        sentence_count = len(_SENTENCE_END_RE.findall(full_text)) + 1
         features["text_length"] = len(full_text)
-        features["word_count"] = len(full_text.split())
-        features["sentence_count"] = len(re.split(r'[.!?]+', full_text))
+        features["word_count"] = word_count
+        features["sentence_count"] = sentence_count
         
         # 词汇特征
-        words = full_text.lower().split()
-        unique_words = set(words)
+        unique_words = {word.lower() for word in words}
         features["vocabulary_size"] = len(unique_words)
         
-        if words:
-            features["lexical_diversity"] = len(unique_words) / len(words)
-            features["avg_word_length"] = np.mean([len(word) for word in words])
+        if word_count:
+            word_lengths = np.fromiter(map(len, words), dtype=np.int32, count=word_count)
+            avg_word_length = float(word_lengths.mean())
+            features["lexical_diversity"] = len(unique_words) / word_count
+            features["avg_word_length"] = avg_word_length
+            # 可读性特征（简化版Flesch-Kincaid）；有词时平均词长必然大于0
+            features["readability_score"] = 206.835 - 1.015 * (word_count / sentence_count) - 84.6 * avg_word_length
         else:
             features["lexical_diversity"] = 0.0
             features["avg_word_length"] = 0.0
-        
-        # 可读性特征（简化版Flesch-Kincaid）
-        if features["sentence_count"] > 0 and features["word_count"] > 0:
-            features["readability_score"] = 206.835 - 1.015 * (features["word_count"] / features["sentence_count"]) - 84.6 * (features["avg_word_length"] if features["avg_word_length"] else 5)
-        else:
             features["readability_score"] = 0.0
         
-        # 主题特征（如果有足够的文本）
-        if len(full_text) > 100 and self.vectorizer and self.lda_model:
-            try:
-                # 向量化文本
-                X = self.vectorizer.fit_transform([full_text])
-                feature_names = self.vectorizer.get_feature_names_out()
-                self.feature_names = list(feature_names)
-                
-                # 应用LDA
-                topic_distribution = self.lda_model.fit_transform(X)
-                
-                # 添加主题特征
-                for i in range(min(5, topic_distribution.shape[1])):
-                    features[f"topic_{i}_weight"] = float(topic_distribution[0, i])
-                
-                # 获取主要主题
-                main_topic = np.argmax(topic_distribution[0])
-                features["main_topic"] = int(main_topic)
-                features["topic_entropy"] = float(self._calculate_entropy(topic_distribution[0]))
-                
-            except Exception as e:
-                logger.debug(f"主题提取失败: {e}")
+        # 主题特征（由批量推断得到的主题分布）
+        if topic_distribution is not None:
+            for i in range(min(5, topic_distribution.shape[0])):
+                features[f"topic_{i}_weight"] = float(topic_distribution[i])
+            
+            # 获取主要主题
+            features["main_topic"] = int(np.argmax(topic_distribution))
+            features["topic_entropy"] = self._calculate_entropy(topic_distribution)
         
         return features
     
+    def _topic_model_fitted(self) -> bool:
+        """向量器与LDA模型是否都已拟合"""
+        return hasattr(self.vectorizer, "vocabulary_") and hasattr(self.lda_model, "components_")
+    
     def _extract_tech_features(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
         """提取技术特征"""
         features = {}
@@ -267,13 +393,16 @@ class FeatureExtractor:
             features["tech_count"] = len(tech_stack)
             features["tech_diversity"] = min(len(set(tech_stack)) / max(len(tech_stack), 1), 1.0)
             
+            # 字符串技术只小写一次，供类别分布和热门技术检测共用
+            str_techs = [tech for tech in tech_stack if isinstance(tech, str)]
+            lowered = [tech.lower() for tech in str_techs]
+            
             # 技术类别分布
-            tech_categories = self._categorize_technologies(tech_stack)
+            tech_categories = self._categorize_technologies(str_techs, lowered)
             features["tech_category_count"] = len(tech_categories)
             
             # 热门技术检测
-            popular_tech = ["python", "javascript", "react", "docker", "postgresql"]
-            popular_count = sum(1 for tech in tech_stack if isinstance(tech, str) and tech.lower() in popular_tech)
+            popular_count = sum(1 for tech in lowered if tech in POPULAR_TECH)
             features["popular_tech_ratio"] = popular_count / max(len(tech_stack), 1)
             
         else:
@@ -284,38 +413,17 @@ class FeatureExtractor:
         
         return features
     
-    def _categorize_technologies(self, tech_stack: List[str]) -> Dict[str, List[str]]:
-        """按类别分组技术"""
+    def _categorize_technologies(self, tech_stack: List[str], lowered: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """按类别分组技术；lowered为调用方已算好的小写技术名（与tech_stack一一对应）"""
         categories = {}
         
-        # 简单的类别映射（实际应用中应该更详细）
-        category_map = {
-            "language": ["python", "javascript", "java", "c++", "c#", "go", "rust", "ruby", "php", "swift"],
-            "framework": ["django", "flask", "fastapi", "express", "react", "vue", "angular", "spring", "laravel"],
-            "database": ["postgresql", "mysql", "mongodb", "redis", "elasticsearch", "cassandra"],
-            "cloud": ["aws", "azure", "google_cloud", "aliyun", "heroku"],
-            "tool": ["docker", "kubernetes", "git", "jenkins", "terraform"]
-        }
+        if lowered is None:
+            tech_stack = [tech for tech in tech_stack if isinstance(tech, str)]
+            lowered = [tech.lower() for tech in tech_stack]
         
-        for tech in tech_stack:
-            if not isinstance(tech, str):
-                continue
-                
-            tech_lower = tech.lower()
-            assigned = False
-            
-            for category, techs in category_map.items():
-                if tech_lower in techs:
-                    if category not in categories:
-                        categories[category] = []
-                    categories[category].append(tech)
-                    assigned = True
-                    break
-            
-            if not assigned:
-                if "other" not in categories:
-                    categories["other"] = []
-                categories["other"].append(tech)
+        for tech, tech_lower in zip(tech_stack, lowered):
+            category = _TECH_TO_CATEGORY.get(tech_lower, "other")
+            categories.setdefault(category, []).append(tech)
         
         return categories
     
@@ -344,62 +452,82 @@ class FeatureExtractor:
             elif isinstance(value, list):
                 features[f"metadata_list_{key}_count"] = len(value)
         
-        features["metadata_text_length"] = sum(len(str(v)) for v in text_values)
+        # text_values均为str，直接用C层的len求和
+        features["metadata_text_length"] = sum(map(len, text_values))
         features["metadata_numeric_count"] = len(numeric_values)
         
         if numeric_values:
-            features["metadata_numeric_mean"] = float(np.mean(numeric_values))
-            features["metadata_numeric_std"] = float(np.std(numeric_values))
+            # 只构造一次数组，均值和标准差共用
+            numeric_array = np.fromiter(numeric_values, dtype=np.float64, count=len(numeric_values))
+            features["metadata_numeric_mean"] = float(numeric_array.mean())
+            features["metadata_numeric_std"] = float(numeric_array.std())
         
         return features
     
+    def _count_keywords(self, text: str) -> Dict[Tuple[str, str], int]:
+        """统计每个(分组, 类别)在文本中出现的关键词数（同一关键词只计一次）"""
+        counts = defaultdict(int)
+        
+        if _KEYWORD_AUTOMATON is not None:
+            matched = {value for _, value in _KEYWORD_AUTOMATON.iter(text)}
+            for _, keyword_owners in matched:
+                for owner in keyword_owners:
+                    counts[owner] += 1
+        else:
+            for group, category, keyword in _KEYWORD_RECORDS:
+                if keyword in text:
+                    counts[(group, category)] += 1
+        
+        return counts
+    
     def _extract_keyword_features(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
         """提取关键词特征"""
         features = {}
         
-        # 获取所有文本
-        text = ""
+        # 获取名称和描述文本，各自小写后一次性拼接
+        parts = []
         if project_data.get("name"):
-            text += " " + project_data["name"]
+            parts.append(project_data["name"].lower())
         if project_data.get("description"):
-            text += " " + project_data["description"]
+            parts.append(project_data["description"].lower())
         
-        text = text.lower()
+        text = " ".join(parts)
+        counts = self._count_keywords(text)
         
         # 质量关键词
-        quality_scores = {}
-        for category, keywords in self.quality_keywords.items():
-            count = sum(1 for keyword in keywords if keyword in text)
-            quality_scores[category] = count / max(len(keywords), 1)
+        quality_scores = {
+            category: counts[("quality", category)] / max(len(keywords), 1)
+            for category, keywords in QUALITY_KEYWORDS.items()
+        }
         
         features["quality_score_code"] = quality_scores.get("code", 0.0)
         features["quality_score_architecture"] = quality_scores.get("architecture", 0.0)
         features["quality_score_documentation"] = quality_scores.get("documentation", 0.0)
         features["quality_score_testing"] = quality_scores.get("testing", 0.0)
         features["quality_score_security"] = quality_scores.get("security", 0.0)
-        features["overall_quality_score"] = np.mean(list(quality_scores.values())) if quality_scores else 0.0
+        features["overall_quality_score"] = sum(quality_scores.values()) / len(quality_scores) if quality_scores else 0.0
         
         # 创新关键词
-        innovation_scores = {}
-        for category, keywords in self.innovation_keywords.items():
-            count = sum(1 for keyword in keywords if keyword in text)
-            innovation_scores[category] = count / max(len(keywords), 1)
+        innovation_scores = {
+            category: counts[("innovation", category)] / max(len(keywords), 1)
+            for category, keywords in INNOVATION_KEYWORDS.items()
+        }
         
         features["innovation_score_novelty"] = innovation_scores.get("novelty", 0.0)
         features["innovation_score_complexity"] = innovation_scores.get("complexity", 0.0)
         features["innovation_score_automation"] = innovation_scores.get("automation", 0.0)
-        features["overall_innovation_score"] = np.mean(list(innovation_scores.values())) if innovation_scores else 0.0
+        features["overall_innovation_score"] = sum(innovation_scores.values()) / len(innovation_scores) if innovation_scores else 0.0
         
         # 商业关键词
-        business_scores = {}
-        for category, keywords in self.business_keywords.items():
-            count = sum(1 for keyword in keywords if keyword in text)
-            business_scores[category] = count / max(len(keywords), 1)
+        business_scores = {
+            category: counts[("business", category)] / max(len(keywords), 1)
+            for category, keywords in BUSINESS_KEYWORDS.items()
+        }
         
         features["business_score_market"] = business_scores.get("market", 0.0)
         features["business_score_user"] = business_scores.get("user", 0.0)
         features["business_score_scale"] = business_scores.get("scale", 0.0)
-        features["overall_business_score"] = np.mean(list(business_scores.values())) if business_scores else 0.0
+        features["overall_business_score"] = sum(business_scores.values()) / len(business_scores) if business_scores else 0.0
         
         return features
     
@@ -423,13 +551,12 @@ class FeatureExtractor:
         metadata_count = existing_features.get("metadata_field_count", 0)
         features["metadata_complexity"] = min(metadata_count / 20, 1.0)
         
-        # 综合复杂度
-        complexities = [
-            features.get("tech_complexity", 0.0),
-            features.get("text_complexity", 0.0),
-            features.get("metadata_complexity", 0.0)
-        ]
-        features["overall_complexity"] = float(np.mean(complexities))
+        # 综合复杂度（只有三项，直接用Python算术，不构造numpy数组）
+        features["overall_complexity"] = (
+            features["tech_complexity"]
+            + features["text_complexity"]
+            + features["metadata_complexity"]
+        ) / 3
         
         # 项目规模估计
         project_size = 0
@@ -480,15 +607,14 @@ class FeatureExtractor:
         return derived
     
     def _calculate_entropy(self, distribution: np.ndarray) -> float:
-        """计算熵"""
-        # 移除零值避免log(0)
-        distribution = distribution[distribution > 0]
-        if len(distribution) == 0:
-            return 0.0
-        return -np.sum(distribution * np.log2(distribution))
+        """计算熵（以2为底）"""
+        # xlogy在0处取0，无需先用布尔掩码复制出非零元素
+        entropy = -xlogy(distribution, distribution).sum() * _INV_LN2
+        # 全零分布得到-0.0，统一为0.0
+        return max(0.0, float(entropy))
     
     def _make_serializable(self, features: Dict[str, Any]) -> Dict[str, Any]:
-        """确保特征可序列化"""
+        """确保特征可序列化（防御性检查，特征提取主流程已直接产出Python标量）"""
         serializable = {}
         
         for key, value in features.items():
@@ -497,14 +623,16 @@ class FeatureExtractor:
             elif isinstance(value, (np.integer, np.floating)):
                 serializable[key] = float(value)
             elif isinstance(value, np.ndarray):
-                serializable[key] = value.tolist()
+                # 特征字典约定只存放标量（如主题分布已逐项展开为topic_i_weight），
+                # 不在这里逐元素装箱数组，出现即说明上游写法有误
+                logger.warning("特征 %s 为numpy数组，已跳过（特征应为标量）", key)
             else:
                 try:
                     # 尝试转换为字符串
                     serializable[key] = str(value)
                 except:
                     # 如果无法转换，跳过
-                    logger.debug(f"无法序列化特征 {key}: {type(value)}")
+                    logger.debug("无法序列化特征 %s: %s", key, type(value))
         
         return serializable
     
@@ -540,7 +668,7 @@ class FeatureExtractor:
             )
             
             X = self.vectorizer.fit_transform(texts)
-            self.feature_names = self.vectorizer.get_feature_names_out().tolist()
+            self.feature_names = tuple(self.vectorizer.get_feature_names_out())
             
             # 训练LDA模型
             self.lda_model = LatentDirichletAllocation(
@@ -552,10 +680,13 @@ class FeatureExtractor:
             )
             
             self.lda_model.fit(X)
+            self._topic_ready = True
             
-            # 计算模型质量指标
-            perplexity = self.lda_model.perplexity(X)
-            log_likelihood = self.lda_model.score(X)
+            # 计算模型质量指标：fit结束时已在训练集上做过一次完整E步并把困惑度存入bound_，
+            # 对数似然由 perplexity = exp(-log_likelihood / 总词数) 反推，
+            # 不再为perplexity()和score()各自对整个语料重新推断一遍
+            perplexity = self.lda_model.bound_
+            log_likelihood = -np.log(perplexity) * X.sum()
             
             # 保存模型
             self._save_model()
@@ -570,6 +701,8 @@ class FeatureExtractor:
             
         except Exception as e:
             logger.error(f"训练特征提取模型失败: {e}")
+            # 训练中途失败时向量器可能已被替换为未拟合的实例
+            self._topic_ready = self._topic_model_fitted()
             return {"error": str(e)}
     
     def _save_model(self):
@@ -577,15 +710,14 @@ class FeatureExtractor:
         try:
             self.model_path.parent.mkdir(parents=True, exist_ok=True)
             
-            import pickle
             model_data = {
                 'vectorizer': self.vectorizer,
                 'lda_model': self.lda_model,
                 'feature_names': self.feature_names
             }
             
-            with open(self.model_path, 'wb') as f:
-                pickle.dump(model_data, f)
+            # 不压缩：压缩后的文件无法内存映射加载
+            joblib.dump(model_data, self.model_path)
             
             logger.info(f"特征提取器保存到: {self.model_path}")
             
@@ -3,14 +3,16 @@ NLP处理器
 自然语言处理功能
 """
 
+import functools
 import logging
 import re
-from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Set, Tuple
 import numpy as np
 from pathlib import Path
 import json
 import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
+from nltk.tokenize import sent_tokenize
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 from nltk import pos_tag
@@ -18,8 +20,165 @@ from collections import Counter
 import warnings
 from config import settings
 
+# pyahocorasick为可选依赖，不可用时逐个关键词做子串查找
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# spaCy为可选依赖（查表词形还原需同时安装spacy-lookups-data），不可用时使用NLTK WordNet
+try:
+    import spacy
+    from spacy.tokens import Doc
+except ImportError:
+    spacy = None
+
+# numba为可选依赖，不可用时音节统计以纯Python执行
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """numba不可用时的空装饰器"""
+        def decorator(func):
+            return func
+        return decorator
+
 logger = logging.getLogger(__name__)
 
+# 词形还原缓存容量
+LEMMA_CACHE_SIZE = 50000
+
+# spaCy批量词形还原的批大小
+SPACY_BATCH_SIZE = 64
+
+# 分词正则：单词（保留连字符复合词，如cutting-edge）或单个标点，模块加载时编译一次
+_TOKEN_RE = re.compile(r"\w+(?:-\w+)*|[^\w\s]")
+
+
+# 主题关键词（简化版主题分析）
+TOPIC_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "technology": ("software", "application", "system", "code", "program"),
+    "business": ("business", "market", "product", "revenue", "profit"),
+    "development": ("develop", "build", "create", "implement", "design"),
+    "quality": ("quality", "reliable", "secure", "efficient", "test"),
+    "innovation": ("innovative", "novel", "unique", "advanced", "cutting-edge")
+}
+
+# 实体提取正则：各组模式合并为一个带命名分组的正则，一次扫描；
+# 分组名g0、g1...保留原有的组顺序，结果按组号稳定排序以保持原输出顺序
+_TECH_ENTITY_PATTERNS = (
+    r'python|javascript|java|c\+\+|c#|go|rust|ruby|php|swift',
+    r'react|vue|angular|django|flask|fastapi|express|spring|laravel',
+    r'postgresql|mysql|mongodb|redis|elasticsearch|cassandra',
+    r'aws|azure|google cloud|aliyun|heroku',
+    r'docker|kubernetes|git|jenkins|terraform'
+)
+_PROJECT_ENTITY_PATTERNS = (
+    r'project|application|system|platform|solution',
+    r'api|sdk|library|framework|tool',
+    r'database|server|client|interface|protocol'
+)
+
+
+def _compile_entity_patterns(patterns: Tuple[str, ...]) -> re.Pattern:
+    """将多组按单词边界匹配的模式合并为一个带命名分组的正则"""
+    return re.compile(
+        "|".join(rf"\b(?P<g{i}>{pattern})\b" for i, pattern in enumerate(patterns)),
+        re.IGNORECASE
+    )
+
+
+_TECH_ENTITY_RE = _compile_entity_patterns(_TECH_ENTITY_PATTERNS)
+_PROJECT_ENTITY_RE = _compile_entity_patterns(_PROJECT_ENTITY_PATTERNS)
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_URL_RE = re.compile(r'https?://[^\s]+')
+_EMAIL_RE = re.compile(r'\b[\w\.-]+@[\w\.-]+\.\w+\b')
+
+
+def _group_ordered_matches(pattern: re.Pattern, text: str) -> List[re.Match]:
+    """一次扫描取得全部匹配，并按分组顺序（组内按文本位置）排列"""
+    return sorted(pattern.finditer(text), key=lambda match: int(match.lastgroup[1:]))
+
+
+@njit(cache=True, nogil=True)
+def _syllable_kernel(buf: np.ndarray, ends: np.ndarray, char_lens: np.ndarray) -> Tuple[int, int]:
+    """音节统计内核：buf为小写单词拼接后的UTF-8字节，ends为各词的字节结束位置，
+    char_lens为各词的字符数；返回(音节总数, 复杂词数)"""
+    syllable_count = 0
+    complex_count = 0
+    start = 0
+    
+    for i in range(ends.shape[0]):
+        end = ends[i]
+        
+        if char_lens[i] <= 3:
+            syllable_count += 1
+        else:
+            # 与纯Python实现一致：初始prev_char为''，视为元音，因此词首元音不计
+            syllable_in_word = 0
+            prev_vowel = True
+            for j in range(start, end):
+                c = buf[j]
+                # a e i o u y
+                is_vowel = c == 97 or c == 101 or c == 105 or c == 111 or c == 117 or c == 121
+                if is_vowel and not prev_vowel:
+                    syllable_in_word += 1
+                prev_vowel = is_vowel
+            
+            if syllable_in_word == 0:
+                syllable_in_word = 1
+            
+            syllable_count += syllable_in_word
+            if syllable_in_word > 3:
+                complex_count += 1
+        
+        start = end
+    
+    return syllable_count, complex_count
+
+
+# 分句回退正则：NLTK punkt数据不可用时按句末标点切分
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _tokenize(text: str) -> List[str]:
+    """正则分词，替代每次调用都较重的nltk.word_tokenize"""
+    return _TOKEN_RE.findall(text)
+
+
+def _split_sentences(text: str) -> List[str]:
+    """分句，punkt数据缺失时回退到正则切分"""
+    try:
+        return sent_tokenize(text)
+    except LookupError as e:
+        logger.debug("NLTK分句不可用，使用正则分句: %s", e)
+        return [sentence for sentence in _SENTENCE_RE.split(text) if sentence]
+
+
+@dataclass
+class TokenizedText:
+    """一次分词/分句的结果，在analyze_text的各子分析之间共享"""
+    text: str
+    text_lower: str
+    sentences: List[str]
+    words: List[str]
+    words_lower: List[str]
+    
+    @classmethod
+    def from_text(cls, text: str) -> "TokenizedText":
+        """从原始文本构建"""
+        words = _tokenize(text)
+        return cls(
+            text=text,
+            text_lower=text.lower(),
+            sentences=_split_sentences(text),
+            words=words,
+            words_lower=[word.lower() for word in words]
+        )
+
 
 class NLPProcessor:
     """NLP处理器"""
@@ -31,6 +190,8 @@ class NLPProcessor:
         # NLP工具
         self.stop_words = set()
         self.lemmatizer = None
+        self._lemmatize = None
+        self._spacy_nlp = None
         self.sentiment_lexicon = {}
         
         # 关键词词典
@@ -62,9 +223,35 @@ class NLPProcessor:
             ]
         }
         
+        # 关键词类别和主题关键词编译为一个自动机，一次扫描得到文本中出现的全部关键词
+        self._all_keywords = frozenset(
+            keyword
+            for keyword_dict in (self.keyword_categories, TOPIC_KEYWORDS)
+            for keywords in keyword_dict.values()
+            for keyword in keywords
+        )
+        self._keyword_automaton = self._build_keyword_automaton()
+        
         # 情感词典（简化版）
         self._init_sentiment_lexicon()
     
+    def _build_keyword_automaton(self):
+        """构建Aho-Corasick自动机：关键词 -> 关键词"""
+        if ahocorasick is None:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for keyword in self._all_keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def _match_keywords(self, text_lower: str) -> Set[str]:
+        """返回在小写文本中（以子串形式）出现的关键词集合"""
+        if self._keyword_automaton is not None:
+            return {keyword for _, keyword in self._keyword_automaton.iter(text_lower)}
+        return {keyword for keyword in self._all_keywords if keyword in text_lower}
+    
     async def load_model(self):
         """加载模型"""
         try:
@@ -102,6 +289,8 @@ class NLPProcessor:
             # 初始化工具
             self.stop_words = set(stopwords.words('english'))
             self.lemmatizer = WordNetLemmatizer()
+            # 词形还原结果缓存：词频呈长尾分布，重复词直接命中缓存，避免反复查询WordNet
+            self._lemmatize = functools.lru_cache(maxsize=LEMMA_CACHE_SIZE)(self.lemmatizer.lemmatize)
             
             logger.info("NLP工具初始化完成")
             
@@ -109,6 +298,25 @@ class NLPProcessor:
             logger.warning(f"NLP工具初始化失败: {e}")
             self.stop_words = set(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'])
             self.lemmatizer = None
+            self._lemmatize = None
+        
+        # spaCy查表词形还原可用时优先使用（整批查表，无WordNet磁盘查询）
+        self._spacy_nlp = self._init_spacy_lemmatizer()
+    
+    def _init_spacy_lemmatizer(self):
+        """初始化只含查表lemmatizer的spaCy空白管线，不可用时返回None"""
+        if spacy is None:
+            return None
+        
+        try:
+            nlp = spacy.blank("en")
+            nlp.add_pipe("lemmatizer", config={"mode": "lookup"})
+            nlp.initialize()
+            logger.info("使用spaCy查表词形还原")
+            return nlp
+        except Exception as e:
+            logger.info("spaCy查表词形还原不可用，使用NLTK: %s", e)
+            return None
     
     def _init_sentiment_lexicon(self):
         """初始化情感词典"""
@@ -134,34 +342,64 @@ class NLPProcessor:
         
         for word in negative_words:
             self.sentiment_lexicon[word] = -1.0
+        
+        # 情感词集合，用于C层的集合成员判断
+        self._positive_words = frozenset(word for word, score in self.sentiment_lexicon.items() if score > 0)
+        self._sentiment_words = frozenset(self.sentiment_lexicon)
     
     async def analyze_text(self, text: str) -> Dict[str, Any]:
         """分析文本"""
-        try:
-            if not text or not isinstance(text, str):
-                return self._empty_analysis_result()
-            
-            text = text.strip()
-            if not text:
-                return self._empty_analysis_result()
+        return (await self.analyze_text_batch([text]))[0]
+    
+    async def analyze_text_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """批量分析文本：先逐条分词，再整批词形还原（spaCy可用时经lemmatizer.pipe批处理），最后逐条完成各项分析"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        prepared: List[Tuple[int, TokenizedText, List[str]]] = []
+        
+        for i, text in enumerate(texts):
+            if not text or not isinstance(text, str) or not text.strip():
+                results[i] = self._empty_analysis_result()
+                continue
             
+            try:
+                # 分句、分词、小写化只做一次，结果共享给各子分析
+                tokens = TokenizedText.from_text(text.strip())
+                prepared.append((i, tokens, self._filter_words(tokens.words_lower)))
+            except Exception as e:
+                results[i] = self._error_analysis_result(e)
+        
+        lemmatized = self._lemmatize_batch([filtered_words for _, _, filtered_words in prepared])
+        
+        for (i, tokens, filtered_words), lemmatized_words in zip(prepared, lemmatized):
+            results[i] = self._analyze_tokens(tokens, filtered_words, lemmatized_words)
+        
+        return results
+    
+    def _analyze_tokens(
+        self,
+        tokens: TokenizedText,
+        filtered_words: List[str],
+        lemmatized_words: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """基于分词结果完成单条文本的全部分析"""
+        try:
             # 基础文本分析
-            basic_analysis = self._analyze_basic_text(text)
+            basic_analysis = self._analyze_basic_text(tokens, filtered_words, lemmatized_words)
             
             # 关键词提取
-            keyword_analysis = self._extract_keywords(text)
+            keyword_analysis = self._extract_keywords(tokens)
             
             # 情感分析
-            sentiment_analysis = self._analyze_sentiment(text)
+            sentiment_analysis = self._analyze_sentiment(tokens)
             
             # 实体提取（简化版）
-            entity_analysis = self._extract_entities(text)
+            entity_analysis = self._extract_entities(tokens)
             
             # 主题分析
-            topic_analysis = self._analyze_topics(text)
+            topic_analysis = self._analyze_topics(tokens)
             
             # 可读性分析
-            readability_analysis = self._analyze_readability(text)
+            readability_analysis = self._analyze_readability(tokens)
             
             # 合并所有分析结果
             analysis_result = {
@@ -171,9 +409,9 @@ class NLPProcessor:
                 "entities": entity_analysis,
                 "topics": topic_analysis,
                 "readability": readability_analysis,
-                "summary": self._generate_summary(text),
+                "summary": self._generate_summary(tokens),
                 "metadata": {
-                    "text_length": len(text),
+                    "text_length": len(tokens.text),
                     "processing_time": "real-time",
                     "model_version": self.version
                 }
@@ -182,16 +420,20 @@ class NLPProcessor:
             return analysis_result
             
         except Exception as e:
-            logger.error(f"文本分析失败: {e}")
-            return {
-                "error": str(e),
-                "basic": {"word_count": 0, "sentence_count": 0},
-                "keywords": {"categories": {}},
-                "sentiment": {"score": 0.0, "label": "neutral"},
-                "entities": {"count": 0, "list": []},
-                "topics": {"count": 0, "list": []},
-                "readability": {"score": 0.0, "level": "unknown"}
-            }
+            return self._error_analysis_result(e)
+    
+    def _error_analysis_result(self, error: Exception) -> Dict[str, Any]:
+        """分析失败时的结果"""
+        logger.error("文本分析失败: %s", error)
+        return {
+            "error": str(error),
+            "basic": {"word_count": 0, "sentence_count": 0},
+            "keywords": {"categories": {}},
+            "sentiment": {"score": 0.0, "label": "neutral"},
+            "entities": {"count": 0, "list": []},
+            "topics": {"count": 0, "list": []},
+            "readability": {"score": 0.0, "level": "unknown"}
+        }
     
     def _empty_analysis_result(self) -> Dict[str, Any]:
         """空分析结果"""
@@ -206,36 +448,64 @@ class NLPProcessor:
             "metadata": {"text_length": 0, "processing_time": "instant", "model_version": self.version}
         }
     
-    def _analyze_basic_text(self, text: str) -> Dict[str, Any]:
-        """基础文本分析"""
+    def _filter_words(self, words: List[str]) -> List[str]:
+        """移除标点和停用词"""
+        stop_words = self.stop_words
+        return [word for word in words if word.isalnum() and word not in stop_words]
+    
+    def _lemmatize_batch(self, word_lists: List[List[str]]) -> List[Optional[List[str]]]:
+        """
+        批量词形还原
+        
+        优先使用spaCy查表（按已过滤的词直接构建Doc，与输入一一对应，整批经lemmatizer.pipe处理），
+        其次使用带缓存的WordNet；还原失败的条目返回None。
+        """
+        if self._spacy_nlp is not None:
+            try:
+                vocab = self._spacy_nlp.vocab
+                lemmatizer = self._spacy_nlp.get_pipe("lemmatizer")
+                docs = (Doc(vocab, words=words) for words in word_lists)
+                return [
+                    [token.lemma_ for token in doc]
+                    for doc in lemmatizer.pipe(docs, batch_size=SPACY_BATCH_SIZE)
+                ]
+            except Exception as e:
+                logger.error("词形还原失败: %s", e)
+                return [None] * len(word_lists)
+        
+        if self._lemmatize is None:
+            return word_lists
+        
+        lemmatize = self._lemmatize
+        results = []
+        for words in word_lists:
+            try:
+                results.append([lemmatize(word) for word in words])
+            except Exception as e:
+                logger.error("词形还原失败: %s", e)
+                results.append(None)
+        return results
+    
+    def _analyze_basic_text(
+        self,
+        tokens: TokenizedText,
+        filtered_words: List[str],
+        lemmatized_words: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """基础文本分析（过滤后的词及其词形还原结果由批量流程传入）"""
         try:
-            # 句子分割
-            sentences = sent_tokenize(text)
-            
-            # 单词分割
-            words = word_tokenize(text.lower())
-            
-            # 移除标点和停用词
-            filtered_words = []
-            for word in words:
-                if word.isalnum() and word not in self.stop_words:
-                    filtered_words.append(word)
-            
-            # 词形还原
-            lemmatized_words = []
-            if self.lemmatizer:
-                for word in filtered_words:
-                    lemmatized = self.lemmatizer.lemmatize(word)
-                    lemmatized_words.append(lemmatized)
-            else:
-                lemmatized_words = filtered_words
+            if lemmatized_words is None:
+                return self._empty_basic_analysis()
+            
+            sentences = tokens.sentences
+            words = tokens.words_lower
             
             # 词性标注
             pos_tags = []
             try:
                 pos_tags = pos_tag(filtered_words)
             except Exception as e:
-                logger.debug(f"词性标注失败: {e}")
+                logger.debug("词性标注失败: %s", e)
             
             # 词频统计
             word_freq = Counter(lemmatized_words)
@@ -262,40 +532,37 @@ class NLPProcessor:
             }
             
         except Exception as e:
-            logger.error(f"基础文本分析失败: {e}")
-            return {
-                "sentence_count": 0,
-                "word_count": 0,
-                "unique_word_count": 0,
-                "avg_sentence_length": 0,
-                "avg_word_length": 0,
-                "lexical_diversity": 0,
-                "top_words": [],
-                "pos_distribution": {},
-                "filtered_word_count": 0
-            }
+            logger.error("基础文本分析失败: %s", e)
+            return self._empty_basic_analysis()
+    
+    def _empty_basic_analysis(self) -> Dict[str, Any]:
+        """基础文本分析失败时的结果"""
+        return {
+            "sentence_count": 0,
+            "word_count": 0,
+            "unique_word_count": 0,
+            "avg_sentence_length": 0,
+            "avg_word_length": 0,
+            "lexical_diversity": 0,
+            "top_words": [],
+            "pos_distribution": {},
+            "filtered_word_count": 0
+        }
     
-    def _extract_keywords(self, text: str) -> Dict[str, Any]:
+    def _extract_keywords(self, tokens: TokenizedText) -> Dict[str, Any]:
         """提取关键词"""
         try:
-            text_lower = text.lower()
-            words = word_tokenize(text_lower)
+            text_lower = tokens.text_lower
+            words = tokens.words_lower
             
-            # 统计每个类别的关键词出现次数
+            # 统计每个类别的关键词出现次数（一次扫描得到命中的关键词，再按类别归集）
+            matched = self._match_keywords(text_lower)
             category_counts = {}
             category_words = {}
             
             for category, keywords in self.keyword_categories.items():
-                count = 0
-                found_words = []
-                
-                for keyword in keywords:
-                    # 简单的字符串匹配
-                    if keyword in text_lower:
-                        count += 1
-                        found_words.append(keyword)
-                
-                category_counts[category] = count
+                found_words = [keyword for keyword in keywords if keyword in matched]
+                category_counts[category] = len(found_words)
                 category_words[category] = found_words
             
             # 计算类别权重
@@ -323,7 +590,7 @@ class NLPProcessor:
             }
             
         except Exception as e:
-            logger.error(f"关键词提取失败: {e}")
+            logger.error("关键词提取失败: %s", e)
             return {
                 "categories": {},
                 "category_weights": {},
@@ -332,20 +599,15 @@ class NLPProcessor:
                 "total_keywords": 0
             }
     
-    def _analyze_sentiment(self, text: str) -> Dict[str, Any]:
+    def _analyze_sentiment(self, tokens: TokenizedText) -> Dict[str, Any]:
         """情感分析"""
         try:
-            text_lower = text.lower()
-            words = word_tokenize(text_lower)
-            
-            # 计算情感分数
-            sentiment_score = 0.0
-            sentiment_words = []
+            words = tokens.words_lower
             
-            for word in words:
-                if word in self.sentiment_lexicon:
-                    sentiment_score += self.sentiment_lexicon[word]
-                    sentiment_words.append(word)
+            # 计算情感分数：词典中积极词为+1、消极词为-1，分数 = 积极词数 - 消极词数
+            sentiment_words = [word for word in words if word in self._sentiment_words]
+            positive_count = sum(1 for word in sentiment_words if word in self._positive_words)
+            sentiment_score = float(2 * positive_count - len(sentiment_words))
             
             # 归一化到[-1, 1]
             word_count = len(words)
@@ -375,7 +637,7 @@ class NLPProcessor:
             }
             
         except Exception as e:
-            logger.error(f"情感分析失败: {e}")
+            logger.error("情感分析失败: %s", e)
             return {
                 "score": 0.0,
                 "label": "neutral",
@@ -385,56 +647,41 @@ class NLPProcessor:
                 "method": "error"
             }
     
-    def _extract_entities(self, text: str) -> Dict[str, Any]:
+    def _extract_entities(self, tokens: TokenizedText) -> Dict[str, Any]:
         """提取实体（简化版）"""
         try:
+            text = tokens.text
             entities = []
             
-            # 提取技术栈实体（基于常见技术名称）
-            tech_patterns = [
-                r'\b(python|javascript|java|c\+\+|c#|go|rust|ruby|php|swift)\b',
-                r'\b(react|vue|angular|django|flask|fastapi|express|spring|laravel)\b',
-                r'\b(postgresql|mysql|mongodb|redis|elasticsearch|cassandra)\b',
-                r'\b(aws|azure|google cloud|aliyun|heroku)\b',
-                r'\b(docker|kubernetes|git|jenkins|terraform)\b'
-            ]
-            
-            for pattern in tech_patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    entity = match.group().lower()
-                    if entity not in entities:
-                        entities.append(entity)
+            # 提取技术栈实体（基于常见技术名称），用集合去重并保持首次出现的顺序
+            seen = set()
+            for match in _group_ordered_matches(_TECH_ENTITY_RE, text):
+                entity = match.group().lower()
+                if entity not in seen:
+                    seen.add(entity)
+                    entities.append(entity)
             
             # 提取项目相关实体
             project_entities = []
-            project_patterns = [
-                r'\b(project|application|system|platform|solution)\b',
-                r'\b(api|sdk|library|framework|tool)\b',
-                r'\b(database|server|client|interface|protocol)\b'
-            ]
-            
-            for pattern in project_patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    # 获取上下文（前2个和后2个词）
-                    start = max(0, match.start() - 20)
-                    end = min(len(text), match.end() + 20)
-                    context = text[start:end].strip()
-                    
-                    project_entities.append({
-                        "entity": match.group().lower(),
-                        "context": context
-                    })
+            for match in _group_ordered_matches(_PROJECT_ENTITY_RE, text):
+                # 获取上下文（前2个和后2个词）
+                start = max(0, match.start() - 20)
+                end = min(len(text), match.end() + 20)
+                context = text[start:end].strip()
+                
+                project_entities.append({
+                    "entity": match.group().lower(),
+                    "context": context
+                })
             
             # 提取数字（版本号、数量等）
-            numbers = re.findall(r'\b\d+(?:\.\d+)?\b', text)
+            numbers = _NUMBER_RE.findall(text)
             
             # 提取URL
-            urls = re.findall(r'https?://[^\s]+', text)
+            urls = _URL_RE.findall(text)
             
             # 提取电子邮件
-            emails = re.findall(r'\b[\w\.-]+@[\w\.-]+\.\w+\b', text)
+            emails = _EMAIL_RE.findall(text)
             
             return {
                 "count": len(entities) + len(project_entities),
@@ -448,7 +695,7 @@ class NLPProcessor:
             }
             
         except Exception as e:
-            logger.error(f"实体提取失败: {e}")
+            logger.error("实体提取失败: %s", e)
             return {
                 "count": 0,
                 "technologies": [],
@@ -460,34 +707,18 @@ class NLPProcessor:
                 "has_contact_info": False
             }
     
-    def _analyze_topics(self, text: str) -> Dict[str, Any]:
+    def _analyze_topics(self, tokens: TokenizedText) -> Dict[str, Any]:
         """主题分析（简化版）"""
         try:
             # 基于关键词的主题分类
-            text_lower = text.lower()
-            
-            # 定义主题和关键词
-            topics = {
-                "technology": ["software", "application", "system", "code", "program"],
-                "business": ["business", "market", "product", "revenue", "profit"],
-                "development": ["develop", "build", "create", "implement", "design"],
-                "quality": ["quality", "reliable", "secure", "efficient", "test"],
-                "innovation": ["innovative", "novel", "unique", "advanced", "cutting-edge"]
-            }
+            matched = self._match_keywords(tokens.text_lower)
             
             topic_scores = {}
             topic_keywords = {}
             
-            for topic, keywords in topics.items():
-                score = 0
-                found_keywords = []
-                
-                for keyword in keywords:
-                    if keyword in text_lower:
-                        score += 1
-                        found_keywords.append(keyword)
-                
-                topic_scores[topic] = score
+            for topic, keywords in TOPIC_KEYWORDS.items():
+                found_keywords = [keyword for keyword in keywords if keyword in matched]
+                topic_scores[topic] = len(found_keywords)
                 topic_keywords[topic] = found_keywords
             
             # 确定主要主题
@@ -516,7 +747,7 @@ class NLPProcessor:
             }
             
         except Exception as e:
-            logger.error(f"主题分析失败: {e}")
+            logger.error("主题分析失败: %s", e)
             return {
                 "count": 0,
                 "scores": {},
@@ -526,42 +757,18 @@ class NLPProcessor:
                 "topic_keywords": {}
             }
     
-    def _analyze_readability(self, text: str) -> Dict[str, Any]:
+    def _analyze_readability(self, tokens: TokenizedText) -> Dict[str, Any]:
         """可读性分析"""
         try:
             # 句子数量
-            sentences = sent_tokenize(text)
-            sentence_count = len(sentences)
+            sentence_count = len(tokens.sentences)
             
             # 单词数量
-            words = word_tokenize(text)
+            words = tokens.words
             word_count = len(words)
             
-            # 音节数量（估计）
-            syllable_count = 0
-            for word in words:
-                # 简单的音节计数规则
-                word_lower = word.lower()
-                vowels = "aeiouy"
-                
-                if len(word_lower) <= 3:
-                    syllable_count += 1
-                else:
-                    # 计算元音数量（简化）
-                    prev_char = ''
-                    syllable_in_word = 0
-                    
-                    for char in word_lower:
-                        if char in vowels:
-                            if prev_char not in vowels:
-                                syllable_in_word += 1
-                        prev_char = char
-                    
-                    # 至少一个音节
-                    if syllable_in_word == 0:
-                        syllable_in_word = 1
-                    
-                    syllable_count += syllable_in_word
+            # 音节数量（估计）与复杂词数量，一次遍历同时统计
+            syllable_count, complex_words = self._syllable_stats(words)
             
             # 计算Flesch-Kincaid可读性分数
             if sentence_count > 0 and word_count > 0:
@@ -606,11 +813,11 @@ class NLPProcessor:
                 "syllable_count": syllable_count,
                 "avg_sentence_length": float(avg_sentence_length),
                 "avg_word_length": float(avg_word_length),
-                "complex_words": self._count_complex_words(words)  # 复杂词数量
+                "complex_words": complex_words  # 复杂词数量
             }
             
         except Exception as e:
-            logger.error(f"可读性分析失败: {e}")
+            logger.error("可读性分析失败: %s", e)
             return {
                 "flesch_score": 0.0,
                 "flesch_kincaid_grade": 0.0,
@@ -623,37 +830,67 @@ class NLPProcessor:
                 "complex_words": 0
             }
     
-    def _count_complex_words(self, words: List[str]) -> int:
-        """计算复杂词数量（超过3个音节的词）"""
+    def _syllable_stats(self, words: List[str]) -> Tuple[int, int]:
+        """估计音节总数并统计复杂词数量（超过3个音节的词），一次遍历完成"""
+        if _NUMBA_AVAILABLE and words:
+            return self._syllable_stats_jit(words)
+        
+        vowels = "aeiouy"
+        syllable_count = 0
         complex_count = 0
         
         for word in words:
             word_lower = word.lower()
-            vowels = "aeiouy"
             
-            # 简单的音节计数
-            syllable_count = 0
+            # 简单的音节计数规则：短词按一个音节计（短词元音组最多两个，不可能是复杂词）
+            if len(word_lower) <= 3:
+                syllable_count += 1
+                continue
+            
+            # 计算元音组数量（简化）
             prev_char = ''
+            syllable_in_word = 0
             
             for char in word_lower:
                 if char in vowels:
                     if prev_char not in vowels:
-                        syllable_count += 1
+                        syllable_in_word += 1
                 prev_char = char
             
             # 至少一个音节
-            if syllable_count == 0:
-                syllable_count = 1
+            if syllable_in_word == 0:
+                syllable_in_word = 1
             
-            if syllable_count > 3:
+            syllable_count += syllable_in_word
+            if syllable_in_word > 3:
                 complex_count += 1
         
-        return complex_count
+        return syllable_count, complex_count
+    
+    def _syllable_stats_jit(self, words: List[str]) -> Tuple[int, int]:
+        """将单词编码为连续字节缓冲区，交给numba内核统计"""
+        lowered = [word.lower() for word in words]
+        char_lens = np.fromiter(map(len, lowered), dtype=np.int64, count=len(lowered))
+        
+        joined = "".join(lowered)
+        if joined.isascii():
+            # 纯ASCII时字节数等于字符数，无需逐词编码
+            buf = np.frombuffer(joined.encode("ascii"), dtype=np.uint8)
+            ends = np.cumsum(char_lens)
+        else:
+            # 非ASCII字符编码为多字节（均不是元音字节），按词的字节长度计算边界
+            encoded = [word.encode("utf-8") for word in lowered]
+            buf = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+            ends = np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)))
+        
+        syllable_count, complex_count = _syllable_kernel(buf, ends, char_lens)
+        return int(syllable_count), int(complex_count)
     
-    def _generate_summary(self, text: str, max_sentences: int = 3) -> str:
+    def _generate_summary(self, tokens: TokenizedText, max_sentences: int = 3) -> str:
         """生成摘要（简化版）"""
+        text = tokens.text
         try:
-            sentences = sent_tokenize(text)
+            sentences = tokens.sentences
             
             if not sentences:
                 return ""
@@ -671,15 +908,14 @@ class NLPProcessor:
             return " ".join(summary_sentences)
             
         except Exception as e:
-            logger.error(f"生成摘要失败: {e}")
+            logger.error("生成摘要失败: %s", e)
             return text[:200] + "..." if len(text) > 200 else text
     
     async def compare_texts(self, text1: str, text2: str) -> Dict[str, Any]:
         """比较两个文本"""
         try:
-            # 分析两个文本
-            analysis1 = await self.analyze_text(text1)
-            analysis2 = await self.analyze_text(text2)
+            # 两个文本合为一批分析（词形还原一次批处理）
+            analysis1, analysis2 = await self.analyze_text_batch([text1, text2])
             
             # 计算相似度
             similarity_score = self._calculate_text_similarity(text1, text2)
@@ -712,7 +948,7 @@ class NLPProcessor:
             }
             
         except Exception as e:
-            logger.error(f"文本比较失败: {e}")
+            logger.error("文本比较失败: %s", e)
             return {"error": str(e)}
     
     def _calculate_text_similarity(self, text1: str, text2: str) -> float:
@@ -722,8 +958,8 @@ class NLPProcessor:
                 return 0.0
             
             # 转换为小写并分词
-            words1 = set(word_tokenize(text1.lower()))
-            words2 = set(word_tokenize(text2.lower()))
+            words1 = set(_tokenize(text1.lower()))
+            words2 = set(_tokenize(text2.lower()))
             
             # 移除停用词
             words1 = words1 - self.stop_words
@@ -739,7 +975,7 @@ class NLPProcessor:
             return intersection / union
             
         except Exception as e:
-            logger.error(f"计算相似度失败: {e}")
+            logger.error("计算相似度失败: %s", e)
             return 0.0
     
     def get_model_info(self) -> Dict[str, Any]:
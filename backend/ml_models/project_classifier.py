@@ -3,6 +3,7 @@
 基于机器学习的项目类型分类
 """
 
+import asyncio
 import logging
 import pickle
 import numpy as np
@@ -290,55 +291,75 @@ class ProjectClassifier:
     
     async def predict(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
         """预测项目类别"""
+        return (await self.predict_batch([project_data]))[0]
+    
+    async def predict_batch(self, projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """批量预测项目类别（所有有文本的项目合并为一次模型调用）"""
         try:
             if self.model is None:
                 await self.load_model()
             
             # 提取文本特征
-            text_features = self._extract_text_features(project_data)
+            texts = [self._extract_text_features(project_data) for project_data in projects]
+            
+            # 如果没有文本特征，返回未知
+            results = [self._unknown_prediction() for _ in projects]
             
             # 预测类别
-            if text_features.strip():
-                predicted_class = self.model.predict([text_features])[0]
-                probabilities = self.model.predict_proba([text_features])[0]
-                
-                # 创建概率字典
-                class_probs = {}
-                for i, class_name in enumerate(self.classes):
-                    if i < len(probabilities):
-                        class_probs[class_name] = float(probabilities[i])
+            indices = [i for i, text in enumerate(texts) if text.strip()]
+            if indices:
+                batch_texts = [texts[i] for i in indices]
+                # 模型推理在工作线程中执行，期间事件循环可继续运行其他分析阶段
+                predicted_classes, batch_probabilities = await asyncio.to_thread(
+                    self._predict_texts, batch_texts
+                )
                 
-                # 获取置信度
-                confidence = float(max(probabilities)) if len(probabilities) > 0 else 0.0
-                
-                return {
-                    "name": predicted_class,
-                    "confidence": confidence,
-                    "category_probabilities": class_probs,
-                    "top_categories": sorted(
-                        [(k, v) for k, v in class_probs.items()],
-                        key=lambda x: x[1],
-                        reverse=True
-                    )[:3]
-                }
-            else:
-                # 如果没有文本特征，返回未知
-                return {
-                    "name": "unknown",
-                    "confidence": 0.0,
-                    "category_probabilities": {"unknown": 1.0},
-                    "top_categories": [("unknown", 1.0)]
-                }
+                for i, predicted_class, probabilities in zip(indices, predicted_classes, batch_probabilities):
+                    results[i] = self._format_prediction(predicted_class, probabilities)
+            
+            return results
             
         except Exception as e:
-            logger.error(f"预测失败: {e}")
-            return {
-                "name": "unknown",
-                "confidence": 0.0,
-                "category_probabilities": {"unknown": 1.0},
-                "top_categories": [("unknown", 1.0)],
-                "error": str(e)
-            }
+            logger.error("预测失败: %s", e)
+            return [
+                {**self._unknown_prediction(), "error": str(e)}
+                for _ in projects
+            ]
+    
+    def _predict_texts(self, texts: List[str]):
+        """对一批文本执行模型推理，返回(预测类别, 类别概率)"""
+        return self.model.predict(texts), self.model.predict_proba(texts)
+    
+    def _format_prediction(self, predicted_class: str, probabilities: np.ndarray) -> Dict[str, Any]:
+        """将单个项目的模型输出整理为预测结果"""
+        # 创建概率字典
+        class_probs = {}
+        for i, class_name in enumerate(self.classes):
+            if i < len(probabilities):
+                class_probs[class_name] = float(probabilities[i])
+        
+        # 获取置信度
+        confidence = float(max(probabilities)) if len(probabilities) > 0 else 0.0
+        
+        return {
+            "name": predicted_class,
+            "confidence": confidence,
+            "category_probabilities": class_probs,
+            "top_categories": sorted(
+                [(k, v) for k, v in class_probs.items()],
+                key=lambda x: x[1],
+                reverse=True
+            )[:3]
+        }
+    
+    def _unknown_prediction(self) -> Dict[str, Any]:
+        """未知类别的预测结果"""
+        return {
+            "name": "unknown",
+            "confidence": 0.0,
+            "category_probabilities": {"unknown": 1.0},
+            "top_categories": [("unknown", 1.0)]
+        }
     
     def _extract_text_features(self, project_data: Dict[str, Any]) -> str:
         """从项目数据中提取文本特征"""
@@ -317,7 +317,7 @@ class TechStackAnalyzer:
             }
             
         except Exception as e:
-            logger.error(f"分析技术栈失败: {e}")
+            logger.error("分析技术栈失败: %s", e)
             return {
                 "detected_tech": [],
                 "analysis": {},
@@ -325,6 +325,10 @@ class TechStackAnalyzer:
                 "error": str(e)
             }
     
+    async def analyze_tech_stack_batch(self, projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """批量分析技术栈（基于规则匹配，逐个处理）"""
+        return [await self.analyze_tech_stack(project_data) for project_data in projects]
+    
     def _detect_technologies(self, project_data: Dict[str, Any]) -> List[str]:
         """检测技术栈"""
         detected = set()
@@ -506,7 +510,7 @@ class TechStackAnalyzer:
             return total_similarity / max(pair_count, 1)
             
         except Exception as e:
-            logger.debug(f"计算内聚性失败: {e}")
+            logger.debug("计算内聚性失败: %s", e)
             return 0.5
     
     def _get_tech_details(self, detected_tech: List[str]) -> List[Dict[str, Any]]:
@@ -5,19 +5,24 @@
 
 import logging
 from typing import List, Optional, Dict, Any
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import uuid
 
 from ..database import get_db, Project
 from ..schemas import AnalysisRequest, AnalysisResult
-from ..ml_models import analyze_project, classify_project, analyze_tech_stack, extract_features
+from ..ml_models import analyze_project, analyze_projects_batch, analyze_project_stream, classify_project, analyze_tech_stack, extract_features
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 批量分析单次请求的最大项目数
+MAX_BATCH_ANALYSIS = 100
+
 
 @router.post("/", response_model=AnalysisResult)
 async def analyze_project_endpoint(
@@ -64,6 +69,64 @@ async def analyze_project_endpoint(
         raise HTTPException(status_code=500, detail=f"分析失败: {str(e)}")
 
 
+@router.post("/batch", response_model=Dict[str, Any])
+async def analyze_projects_batch_endpoint(
+    projects: List[Dict[str, Any]] = Body(..., description="项目数据列表")
+):
+    """
+    批量分析项目
+    
+    Args:
+        projects: 项目数据列表
+        
+    Returns:
+        与输入顺序一致的分析结果
+    """
+    if len(projects) > MAX_BATCH_ANALYSIS:
+        raise HTTPException(status_code=400, detail=f"单次最多分析 {MAX_BATCH_ANALYSIS} 个项目")
+    
+    try:
+        results = await analyze_projects_batch(projects)
+        
+        return {
+            "success": True,
+            "count": len(results),
+            "results": results
+        }
+        
+    except Exception as e:
+        logger.error(f"批量项目分析失败: {e}")
+        raise HTTPException(status_code=500, detail=f"批量分析失败: {str(e)}")
+
+
+@router.post("/stream")
+async def analyze_project_stream_endpoint(
+    project_data: Dict[str, Any] = Body(..., description="项目数据")
+):
+    """
+    流式分析项目
+    
+    Args:
+        project_data: 项目数据
+        
+    Returns:
+        NDJSON流，每个分析阶段完成后输出一行 {"stage": 字段名, "result": 结果}
+    """
+    async def generate():
+        try:
+            async for stage, result in analyze_project_stream(project_data):
+                yield orjson.dumps(
+                    {"stage": stage, "result": result},
+                    default=str,
+                    option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                ) + b"\n"
+        except Exception as e:
+            logger.error("流式项目分析失败: %s", e)
+            yield orjson.dumps({"stage": "error", "result": str(e)}) + b"\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.post("/classify", response_model=Dict[str, Any])
 async def classify_project_endpoint(
     project_data: Dict[str, Any] = Body(..., description="项目数据")
@@ -380,7 +443,7 @@ async def get_recommendations(
                 "description": project.description,
                 "category": project.category,
                 "tech_stack": project.tech_stack,
-                "metadata": project.metadata
+                "metadata": project.extra_metadata
             }
         elif not project_data:
             raise HTTPException(status_code=400, detail="需要提供项目ID或项目数据")
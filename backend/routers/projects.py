@@ -178,7 +178,7 @@ async def create_project(
             description=project_data.description,
             category=project_data.category,
             tech_stack=project_data.tech_stack,
-            metadata=project_data.metadata,
+            extra_metadata=project_data.metadata,
             status="pending"
         )
         
@@ -225,6 +225,8 @@ async def update_project(
         
         # 更新字段
         update_data = project_data.dict(exclude_unset=True)
+        if "metadata" in update_data:
+            update_data["extra_metadata"] = update_data.pop("metadata")
         
         # 如果是pending状态，重置评分
         if project_data.status == "pending":
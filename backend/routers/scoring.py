@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from datetime import datetime
 
-from ..database import get_db, Project, ScoringHistory
+from ..database import get_db, record_score, Project, ScoringHistory
 from ..schemas import (
     ScoringRequest, ScoringResponse, BatchScoringRequest,
     BatchScoringResponse, ScoringResult
@@ -54,7 +54,7 @@ async def score_project(
                 "description": project.description,
                 "category": project.category,
                 "tech_stack": project.tech_stack,
-                "metadata": project.metadata
+                "metadata": project.extra_metadata
             })
             
             # 更新分析结果
@@ -89,21 +89,20 @@ async def score_project(
             scoring_result=scoring_result
         )
         
-        # 创建评分历史记录
-        scoring_history = ScoringHistory(
-            project_id=project.id,
-            quality_score=scoring_result.quality_score,
-            innovation_score=scoring_result.innovation_score,
-            feasibility_score=scoring_result.feasibility_score,
-            business_value_score=scoring_result.business_value_score,
-            overall_score=scoring_result.overall_score,
-            scoring_details=scoring_result.scoring_details,
-            algorithm_version=scoring_result.algorithm_version
-        )
-        
-        db.add(scoring_history)
         await db.commit()
         
+        # 评分历史只追加，交给后台任务批量写入
+        record_score((
+            project.id,
+            scoring_result.quality_score,
+            scoring_result.innovation_score,
+            scoring_result.feasibility_score,
+            scoring_result.business_value_score,
+            scoring_result.overall_score,
+            scoring_result.scoring_details,
+            scoring_result.algorithm_version
+        ))
+        
         logger.info(f"项目 {project.id} 评分完成，综合评分: {scoring_result.overall_score}")
         
         return ScoringResponse(
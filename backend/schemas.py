@@ -4,7 +4,7 @@
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from pydantic import AliasChoices, BaseModel, Field, validator
 from enum import Enum
 
 
@@ -105,7 +105,11 @@ class ProjectResponse(BaseModel):
     description: Optional[str] = Field(None, description="项目描述")
     category: Optional[str] = Field(None, description="项目分类")
     tech_stack: Optional[List[str]] = Field(default_factory=list, description="技术栈")
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="元数据")
+    metadata: Optional[Dict[str, Any]] = Field(
+        default_factory=dict,
+        validation_alias=AliasChoices("extra_metadata", "metadata"),
+        description="元数据"
+    )
     
     # 评分字段
     quality_score: Optional[float] = Field(None, description="质量评分")
@@ -596,7 +596,7 @@ async def calculate_project_score(project, algorithm: ScoringAlgorithm = Scoring
                 "description": project.description,
                 "category": project.category,
                 "tech_stack": project.tech_stack,
-                "metadata": project.metadata
+                "metadata": project.extra_metadata
             }
         else:
             # 如果是字典
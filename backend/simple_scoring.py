@@ -0,0 +1,134 @@
+# backend/simple_scoring.py - 简化的评分算法（app_simple与app_cloud共用）
+from itertools import product
+from typing import Dict, Any, Tuple
+
+# 复杂度等级；未知取值与"低"的评分相同
+_COMPLEXITY_LEVELS = ("低", "中等", "高", "非常高")
+# 复杂度等级在评分内核中的编码
+_COMPLEXITY_CODES = {"低": 0, "中等": 1, "高": 2, "非常高": 3}
+# 团队规模超过6人后评分与明细都不再变化
+_TEAM_SIZE_CAP = 6
+
+# numba为可选依赖，不可用时评分内核以纯Python执行
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """numba不可用时的空装饰器"""
+        def decorator(func):
+            return func
+        return decorator
+
+
+def _score_inputs(project_data: Dict[str, Any]) -> Tuple[bool, bool, bool, Any, str]:
+    """提取影响评分的字段并归一化（未提供团队规模时按1人计算）"""
+    team_size = project_data.get("team_size")
+    complexity = project_data.get("estimated_complexity")
+    return (
+        bool(project_data.get("has_documentation")),
+        bool(project_data.get("has_tests")),
+        bool(project_data.get("has_ci_cd")),
+        1 if team_size is None else team_size,
+        complexity if complexity in _COMPLEXITY_LEVELS else "低",
+    )
+
+
+@njit(cache=True)
+def _score_kernel(has_documentation, has_tests, has_ci_cd, team_size, complexity_code):
+    """评分内核，返回(总分, 团队规模分, 复杂度分)"""
+    # 基础分加上项目特征分
+    score = 50.0 + 10 * has_documentation + 15 * has_tests + 10 * has_ci_cd
+    
+    # 根据团队规模调整
+    if team_size > 5:
+        score += 5
+    elif team_size > 10:
+        score += 10
+    
+    # 根据复杂度调整
+    complexity_points = 0
+    if complexity_code == 1:
+        complexity_points = 5
+    elif complexity_code == 2:
+        complexity_points = 10
+    score += complexity_points
+    
+    # 确保分数在0-100之间
+    score = max(0.0, min(100.0, score))
+    return score, min(10, (team_size - 1) * 2), complexity_points
+
+
+# 表外输入使用的纯Python内核：团队规模可能是小数或其他类型，不交给numba编译
+_score_kernel_py = getattr(_score_kernel, "py_func", _score_kernel)
+
+
+def _calculate_score(inputs: Tuple[bool, bool, bool, Any, str], kernel=_score_kernel) -> Tuple[float, Tuple, Tuple]:
+    """计算项目评分（纯函数）"""
+    has_documentation, has_tests, has_ci_cd, team_size, complexity = inputs
+    
+    score, team_points, complexity_points = kernel(
+        int(has_documentation), int(has_tests), int(has_ci_cd),
+        team_size, _COMPLEXITY_CODES[complexity]
+    )
+    
+    # 生成详细评分
+    breakdown = (
+        ("基础分", 50.0),
+        ("文档完整性", 10 if has_documentation else 0),
+        ("测试覆盖", 15 if has_tests else 0),
+        ("CI/CD", 10 if has_ci_cd else 0),
+        ("团队规模", team_points),
+        ("项目复杂度", complexity_points)
+    )
+    
+    # 生成建议
+    recommendations = []
+    if not has_documentation:
+        recommendations.append("建议添加项目文档")
+    if not has_tests:
+        recommendations.append("建议添加单元测试")
+    if not has_ci_cd:
+        recommendations.append("建议配置CI/CD流水线")
+    
+    # 达到上限时返回整数100，与min(100, score)的结果一致
+    final_score = 100 if score >= 100 else round(score, 1)
+    return final_score, breakdown, tuple(recommendations[:3])  # 最多3条建议
+
+
+# 评分输入的取值域有限，导入时预先计算全部结果
+_SCORE_TABLE = {
+    key: _calculate_score(key)
+    for key in product(
+        (False, True),
+        (False, True),
+        (False, True),
+        range(1, _TEAM_SIZE_CAP + 1),
+        _COMPLEXITY_LEVELS,
+    )
+}
+
+
+class SimpleScoringAlgorithm:
+    """简化的评分算法"""
+    
+    @staticmethod
+    def calculate_score(project_data: Dict[str, Any]) -> Dict[str, Any]:
+        """计算项目评分"""
+        inputs = _score_inputs(project_data)
+        team_size = inputs[3]
+        if type(team_size) is int and team_size >= 1:
+            entry = _SCORE_TABLE[inputs[:3] + (min(team_size, _TEAM_SIZE_CAP),) + inputs[4:]]
+        else:
+            # 0、负数、小数等表外团队规模直接计算
+            entry = _calculate_score(inputs, _score_kernel_py)
+        final_score, breakdown, recommendations = entry
+        
+        # 每次返回新的dict/list，避免调用方修改结果污染评分表
+        return {
+            "final_score": final_score,
+            "breakdown": dict(breakdown),
+            "recommendations": list(recommendations)
+        }
@@ -13,6 +13,13 @@ class CloudSettings:
     # 数据库配置
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/projects.db")
     
+    # 缓存配置（为空时使用进程内缓存）
+    REDIS_URL = os.getenv("REDIS_URL", "")
+    
+    # 分析结果磁盘缓存（需安装diskcache，目录为空时不启用）
+    ANALYSIS_DISK_CACHE_DIR = os.getenv("ANALYSIS_DISK_CACHE_DIR", "./data/analysis_cache")
+    ANALYSIS_DISK_CACHE_SIZE = int(os.getenv("ANALYSIS_DISK_CACHE_SIZE", str(1024 ** 3)))  # 字节
+    
     # 文件存储配置
     DATA_DIR = Path("./data")
     LOGS_DIR = Path("./logs")
@@ -37,6 +44,8 @@ class CloudSettings:
     # 性能配置
     MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
     REQUEST_TIMEOUT = 30  # 秒
+    SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "0"))  # 分析评分进程池大小，0表示不使用进程池
+    MODEL_WARMUP = os.getenv("MODEL_WARMUP", "true").lower() == "true"  # 模型加载后预热
     
     # 功能开关
     FEATURES = {
@@ -0,0 +1,42 @@
+# gunicorn_conf.py - Gunicorn + Uvicorn worker 部署配置
+# 用法: gunicorn backend.app:app -c gunicorn_conf.py
+import os
+
+# 监听地址（Render等平台通过PORT环境变量指定端口）
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}"
+
+# Worker配置：Procfile/Dockerfile启动的app_simple把数据保存在进程内存中，
+# 多个worker之间数据不共享，因此默认只启动一个worker；
+# 使用数据库的backend.app可通过WORKERS环境变量按CPU核心数扩展
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WORKERS", "1"))
+worker_connections = 1000
+timeout = 30
+graceful_timeout = 5
+keepalive = 30
+
+# 在master进程中预先导入应用：评分查找表和numba内核只构建一次，
+# fork后的worker通过写时复制共享这些只读数据
+preload_app = os.getenv("PRELOAD_APP", "true").lower() == "true"
+
+# 日志输出到标准输出
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+
+# 是否将worker绑定到固定CPU核心
+CPU_PINNING = os.getenv("CPU_PINNING", "true").lower() == "true"
+
+
+def post_fork(server, worker):
+    """worker启动后绑定CPU核心，减少上下文切换（等同于 taskset -c i）"""
+    if not CPU_PINNING or not hasattr(os, "sched_setaffinity"):
+        return
+
+    cpus = sorted(os.sched_getaffinity(0))
+    cpu = cpus[(worker.age - 1) % len(cpus)]
+    try:
+        os.sched_setaffinity(0, {cpu})
+        server.log.info(f"worker {worker.pid} 绑定到CPU {cpu}")
+    except OSError as e:
+        server.log.warning(f"worker {worker.pid} 绑定CPU失败: {e}")
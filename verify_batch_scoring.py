@@ -0,0 +1,68 @@
+"""
+智能评分系统 - 批量评分验证脚本
+验证按列float32计算的批量评分与逐项评分内核的结果一致
+"""
+
+import random
+import sys
+
+from backend.ml_models import FEATURE_KEYS, SCORE_DECIMALS, _score_features, calculate_scores_batch
+
+# float32计算后按SCORE_DECIMALS位舍入，允许末位相差1
+TOLERANCE = 10 ** -SCORE_DECIMALS + 1e-9
+
+
+def random_inputs(count, seed=0):
+    """生成随机的特征与技术栈分析结果（部分特征缺失）"""
+    rng = random.Random(seed)
+    features_list = []
+    tech_list = []
+    
+    for _ in range(count):
+        features = {
+            key: rng.choice([rng.randint(0, 2000), rng.random(), 0])
+            for key in FEATURE_KEYS
+            if rng.random() < 0.6
+        }
+        tech_analysis = {"detected_tech": ["tech"] * rng.randint(0, 8)}
+        if rng.random() < 0.5:
+            tech_analysis["tech_maturity"] = rng.random()
+        
+        features_list.append(features)
+        tech_list.append(tech_analysis)
+    
+    return features_list, tech_list
+
+
+def main(count=50000):
+    """主函数"""
+    print("=" * 60)
+    print("批量评分验证")
+    print("=" * 60)
+    
+    features_list, tech_list = random_inputs(count)
+    batch_scores = calculate_scores_batch(features_list, tech_list)
+    
+    max_diff = 0.0
+    flag_mismatches = 0
+    skipped = 0
+    for features, tech_analysis, batch in zip(features_list, tech_list, batch_scores):
+        if batch is None:
+            skipped += 1
+            continue
+        single = _score_features(features, tech_analysis)
+        max_diff = max(max_diff, abs(single[0] - batch[0]), abs(single[1] - batch[1]))
+        flag_mismatches += single[2:] != batch[2:]
+    
+    print(f"  样本数: {count}（未批量计算: {skipped}）")
+    print(f"  评分最大差值: {max_diff:.6f}（允许: {TOLERANCE:.6f}）")
+    print(f"  风险标记不一致: {flag_mismatches}")
+    
+    success = max_diff <= TOLERANCE and flag_mismatches == 0 and skipped == 0
+    print("\n" + ("批量评分与逐项评分一致" if success else "批量评分与逐项评分不一致"))
+    return success
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
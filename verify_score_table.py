@@ -0,0 +1,133 @@
+"""
+智能评分系统 - 简化评分表验证脚本
+验证导入时预先计算的评分表与直接计算的结果完全一致
+"""
+
+import json
+import random
+import sys
+from itertools import product
+
+from backend.simple_scoring import (
+    SimpleScoringAlgorithm,
+    _COMPLEXITY_LEVELS,
+    _SCORE_TABLE,
+    _TEAM_SIZE_CAP,
+    _calculate_score,
+    _score_kernel_py,
+)
+
+
+def reference_score(project_data):
+    """评分规则的直接实现（逐字段计算，不经过评分表）"""
+    score = 50.0
+    
+    if project_data.get("has_documentation", False):
+        score += 10
+    if project_data.get("has_tests", False):
+        score += 15
+    if project_data.get("has_ci_cd", False):
+        score += 10
+    
+    team_size = project_data.get("team_size")
+    if team_size is None:
+        team_size = 1
+    if team_size > 5:
+        score += 5
+    elif team_size > 10:
+        score += 10
+    
+    complexity = project_data.get("estimated_complexity", "低")
+    if complexity == "中等":
+        score += 5
+    elif complexity == "高":
+        score += 10
+    
+    score = max(0, min(100, score))
+    
+    breakdown = {
+        "基础分": 50.0,
+        "文档完整性": 10 if project_data.get("has_documentation") else 0,
+        "测试覆盖": 15 if project_data.get("has_tests") else 0,
+        "CI/CD": 10 if project_data.get("has_ci_cd") else 0,
+        "团队规模": min(10, (team_size - 1) * 2),
+        "项目复杂度": {"低": 0, "中等": 5, "高": 10}.get(complexity, 0)
+    }
+    
+    recommendations = []
+    if not project_data.get("has_documentation", False):
+        recommendations.append("建议添加项目文档")
+    if not project_data.get("has_tests", False):
+        recommendations.append("建议添加单元测试")
+    if not project_data.get("has_ci_cd", False):
+        recommendations.append("建议配置CI/CD流水线")
+    
+    return {
+        "final_score": round(score, 1),
+        "breakdown": breakdown,
+        "recommendations": recommendations[:3]
+    }
+
+
+def same_result(a, b):
+    """按JSON序列化比较（区分100与100.0）"""
+    return json.dumps(a, ensure_ascii=False) == json.dumps(b, ensure_ascii=False)
+
+
+def check_table_entries():
+    """评分表的每一项与纯Python内核直接计算的结果一致"""
+    print("\n评分表条目检查:")
+    keys = list(product(
+        (False, True), (False, True), (False, True),
+        range(1, _TEAM_SIZE_CAP + 1), _COMPLEXITY_LEVELS
+    ))
+    mismatched = [key for key in keys if _SCORE_TABLE[key] != _calculate_score(key, _score_kernel_py)]
+    
+    print(f"  条目数: {len(keys)}，不一致: {len(mismatched)}")
+    for key in mismatched[:5]:
+        print(f"  - {key}")
+    return not mismatched and len(_SCORE_TABLE) == len(keys)
+
+
+def check_random_projects(count=20000, seed=0):
+    """随机项目数据经calculate_score与直接计算的结果一致"""
+    print("\n随机项目检查:")
+    rng = random.Random(seed)
+    team_sizes = [None, 0, -3, 1, 2, 2.5, 3, 5, 5.5, 6, 6.0, 7, 11, 100, True]
+    complexities = list(_COMPLEXITY_LEVELS) + [None, "未知"]
+    
+    mismatched = []
+    for _ in range(count):
+        project_data = {}
+        for field in ("has_documentation", "has_tests", "has_ci_cd"):
+            if rng.random() < 0.8:
+                project_data[field] = rng.choice([True, False, 0, 1, None])
+        if rng.random() < 0.8:
+            project_data["team_size"] = rng.choice(team_sizes + [rng.randint(-5, 50)])
+        if rng.random() < 0.8:
+            project_data["estimated_complexity"] = rng.choice(complexities)
+        
+        if not same_result(SimpleScoringAlgorithm.calculate_score(project_data), reference_score(project_data)):
+            mismatched.append(project_data)
+    
+    print(f"  样本数: {count}，不一致: {len(mismatched)}")
+    for project_data in mismatched[:5]:
+        print(f"  - {project_data}")
+    return not mismatched
+
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("简化评分表验证")
+    print("=" * 60)
+    
+    results = [check_table_entries(), check_random_projects()]
+    
+    print("\n" + ("全部一致" if all(results) else "存在不一致的结果"))
+    return all(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)